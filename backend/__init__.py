@@ -7,6 +7,8 @@ This package provides functions to connect to and interact with Weaviate Cloud.
 from .weaviate_client import (
     connect_to_weaviate_cloud,
     get_weaviate_client,
+    get_async_weaviate_client,
+    get_shared_async_weaviate_client,
     weaviate_connection,
     disconnect_weaviate,
     WeaviateClient
@@ -14,16 +16,18 @@ from .weaviate_client import (
 
 from .weaviate_operations import (
     create_collection,
+    ensure_collection,
     semantic_search,
     keyword_search,
     hybrid_search,
     generative_search,
     insert_object,
     batch_insert,
+    abatch_insert,
     WeaviateOperations
 )
 
-from .config import config, WeaviateConfig
+from .config import get_config, WeaviateConfig
 
 __version__ = "1.0.0"
 __author__ = "Your Name"
@@ -32,21 +36,25 @@ __all__ = [
     # Client functions
     "connect_to_weaviate_cloud",
     "get_weaviate_client", 
+    "get_async_weaviate_client",
+    "get_shared_async_weaviate_client",
     "weaviate_connection",
     "disconnect_weaviate",
     "WeaviateClient",
     
     # Operation functions
     "create_collection",
+    "ensure_collection",
     "semantic_search",
     "keyword_search", 
     "hybrid_search",
     "generative_search",
     "insert_object",
     "batch_insert",
+    "abatch_insert",
     "WeaviateOperations",
     
     # Configuration
-    "config",
+    "get_config",
     "WeaviateConfig"
 ] 
\ No newline at end of file
@@ -1,9 +1,20 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
-import os
-import tempfile
+import atexit
+import orjson
+import re
+import threading
+import time
+import zlib
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import ValueTarget
+from streaming_form_data.validators import MaxSizeValidator, ValidationError
+from weaviate.classes.query import MetadataQuery
 from werkzeug.utils import secure_filename
-from test_pdf_upload_fixed import process_user_pdf
+from embeddings import embed_query
+from search_cache import SemanticCache
+from test_pdf_upload_fixed import COLLECTION_NAME, connect_client, process_user_pdf
 import logging
 
 # Configure logging
@@ -11,28 +22,138 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.config['PROPAGATE_EXCEPTIONS'] = True
 CORS(app)  # Enable CORS for all routes
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'pdf'}
+PDF_MAGIC = b'%PDF'  # every PDF file starts with this header
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB max file size
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read from the request stream at a time
+KEEPALIVE_INTERVAL = 30  # seconds between Weaviate readiness pings
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+WARMUP_QUERIES = ("experience", "education", "skills", "python")
+GZIP_LEVEL = 6  # zlib level for streamed search results
 
-# Ensure upload directory exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+INVALID_FILE_TYPE_RESPONSE = {
+    "success": False,
+    "error": "Invalid file type",
+    "message": "Only PDF files are allowed"
+}
 
-def allowed_file(filename):
-    """Check if file has allowed extension"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+# The health payload never changes, so serialize it once at import
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "message": "PDF Upload API is running"
+})
+
+# Serialized search results of recent queries, reused for near-identical queries.
+# Each gunicorn worker has its own, so clearing it after an upload only
+# affects that worker; the others can serve results up to search_cache.ENTRY_TTL old
+search_cache = SemanticCache()
+
+# Runs of letters and digits, as Weaviate's default "word" tokenization splits text
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _keep_connection_warm(client):
+    """Ping Weaviate's readiness endpoint so pooled connections don't go idle"""
+    while True:
+        time.sleep(KEEPALIVE_INTERVAL)
+        try:
+            client.is_ready()
+        except Exception as e:
+            logger.warning(f"Weaviate keepalive ping failed: {str(e)}")
+
+
+def _warm_up_search(client):
+    """Run a few typical CV queries so the first real search doesn't hit cold indexes or embedding caches"""
+    collection = client.collections.get(COLLECTION_NAME)
+    for query in WARMUP_QUERIES:
+        try:
+            collection.query.hybrid(query=query, vector=embed_query(query), limit=DEFAULT_SEARCH_LIMIT)
+        except Exception as e:
+            logger.warning(f"Search warm-up query '{query}' failed: {str(e)}")
+            return
+
+
+_client_lock = threading.Lock()
+
+
+def get_weaviate_client():
+    """
+    Get this process's Weaviate client, connecting on first use
+    
+    Each gunicorn worker opens one client and reuses it for every request; it
+    is closed at interpreter exit rather than per request/app context.
+    Connecting lazily keeps the (non fork-safe) gRPC channel out of the
+    master process when the app is preloaded.
+    """
+    client = app.config.get('WV_CLIENT')
+    if client is None:
+        with _client_lock:
+            client = app.config.get('WV_CLIENT')
+            if client is None:
+                client = connect_client()
+                app.config['WV_CLIENT'] = client
+                app.extensions['weaviate'] = client
+                atexit.register(client.close)
+                threading.Thread(target=_keep_connection_warm, args=(client,), daemon=True).start()
+                threading.Thread(target=_warm_up_search, args=(client,), daemon=True).start()
+    return client
+
+def _keyword_key(query):
+    """The query's lowercased BM25 terms; hybrid results also depend on them, not just the embedding"""
+    return " ".join(_WORD_RE.findall(query.lower()))
+
+def ojsonify(obj, status=200):
+    """Like flask.jsonify, but serialized with orjson"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def _gzip_stream(chunks):
+    """Gzip byte chunks, flushing after each so the client can decode it on arrival"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        # Pass a client disconnect on to the source generator
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def ndjson_response(chunks):
+    """Stream NDJSON, gzipped chunk by chunk when the client accepts gzip"""
+    if 'gzip' not in request.accept_encodings:
+        return Response(chunks, mimetype='application/x-ndjson')
+    response = Response(_gzip_stream(chunks), mimetype='application/x-ndjson')
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+class NotAPdfError(ValidationError):
+    pass
+
+
+class PdfUploadValidator(MaxSizeValidator):
+    """Enforce the upload size limit and reject non-PDF content from its first bytes"""
+
+    def __init__(self, max_size):
+        super().__init__(max_size)
+        self.head = b''
+
+    def __call__(self, chunk):
+        if len(self.head) < len(PDF_MAGIC):
+            self.head += chunk[:len(PDF_MAGIC) - len(self.head)]
+            if not PDF_MAGIC.startswith(self.head):
+                raise NotAPdfError("File does not start with a PDF header")
+        super().__call__(chunk)
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "message": "PDF Upload API is running"
-    })
+    return Response(HEALTH_BODY, mimetype='application/json')
 
 @app.route('/upload-pdf', methods=['POST'])
 def upload_pdf():
@@ -43,138 +164,190 @@ def upload_pdf():
     Returns: JSON with processing results
     """
     try:
+        # Stream the multipart body straight into memory instead of letting
+        # werkzeug parse and buffer it; the size limit is enforced as bytes arrive
+        validator = PdfUploadValidator(MAX_FILE_SIZE)
+        target = ValueTarget(validator=validator)
+
+        try:
+            parser = StreamingFormDataParser(headers=request.headers)
+            parser.register('pdf', target)
+
+            while True:
+                chunk = request.stream.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.data_received(chunk)
+        except NotAPdfError:
+            return ojsonify(INVALID_FILE_TYPE_RESPONSE, 400)
+        except ValidationError:
+            return ojsonify({
+                "success": False,
+                "error": "File too large",
+                "message": "File size exceeds maximum allowed size (16MB)"
+            }, 413)
+        except ParseFailedException as e:
+            return ojsonify({
+                "success": False,
+                "error": "Invalid upload",
+                "message": f"Could not read multipart form data: {str(e)}"
+            }, 400)
+
         # Check if the post request has the file part
-        if 'pdf' not in request.files:
-            return jsonify({
+        if target.multipart_filename is None:
+            return ojsonify({
                 "success": False,
                 "error": "No file uploaded",
                 "message": "Please select a PDF file to upload"
-            }), 400
+            }, 400)
 
-        file = request.files['pdf']
-        
         # If user does not select file, browser submits empty part without filename
-        if file.filename == '':
-            return jsonify({
+        if target.multipart_filename == '':
+            return ojsonify({
                 "success": False,
                 "error": "No file selected",
                 "message": "Please select a PDF file to upload"
-            }), 400
+            }, 400)
 
-        # Check file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)  # Reset file pointer
-        
-        if file_size > MAX_FILE_SIZE:
-            return jsonify({
-                "success": False,
-                "error": "File too large",
-                "message": f"File size ({file_size / 1024 / 1024:.1f}MB) exceeds maximum allowed size (16MB)"
-            }), 400
+        pdf_bytes = target.value
+        file_size = len(pdf_bytes)
 
-        if file and allowed_file(file.filename):
-            # Secure the filename
-            filename = secure_filename(file.filename)
-            
-            # Create temporary file to store uploaded PDF
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=UPLOAD_FOLDER) as temp_file:
-                file.save(temp_file.name)
-                temp_file_path = temp_file.name
+        # Files too short to hold the header never fail the streaming check
+        if validator.head != PDF_MAGIC:
+            return ojsonify(INVALID_FILE_TYPE_RESPONSE, 400)
+
+        # Secure the filename
+        filename = secure_filename(target.multipart_filename)
+        
+        logger.info(f"Received {filename} ({file_size} bytes)")
+        
+        try:
+            # Process the PDF straight from memory, no temp file round-trip
+            result = process_user_pdf(pdf_bytes, client=get_weaviate_client())
             
-            logger.info(f"Saved uploaded file to: {temp_file_path}")
+            logger.info(f"Processing result: {result}")
             
-            try:
-                # Process the PDF using the updated function
-                result = process_user_pdf(temp_file_path)
-                
-                # Clean up temporary file
-                os.unlink(temp_file_path)
-                
-                logger.info(f"Processing result: {result}")
-                
-                if result["success"]:
-                    return jsonify({
-                        "success": True,
-                        "message": "PDF processed successfully!",
-                        "data": {
-                            "filename": filename,
-                            "file_size_mb": round(file_size / 1024 / 1024, 2),
-                            "total_chunks": result["total_chunks"],
-                            "successful_uploads": result["successful_uploads"],
-                            "failed_uploads": result["failed_uploads"],
-                            "extracted_text_length": result["extracted_text_length"]
-                        }
-                    }), 200
-                else:
-                    return jsonify({
-                        "success": False,
-                        "error": result.get("error", "Unknown error"),
-                        "message": result.get("message", "Failed to process PDF")
-                    }), 500
-                    
-            except Exception as e:
-                # Clean up temporary file on error
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                
-                logger.error(f"Error processing PDF: {str(e)}")
-                return jsonify({
+            if result["success"]:
+                # New chunks can change any query's results
+                search_cache.clear()
+                return ojsonify({
+                    "success": True,
+                    "message": "PDF processed successfully!",
+                    "data": {
+                        "filename": filename,
+                        "file_size_mb": round(file_size / 1024 / 1024, 2),
+                        "total_chunks": result["total_chunks"],
+                        "successful_uploads": result["successful_uploads"],
+                        "failed_uploads": result["failed_uploads"],
+                        "skipped_existing": result["skipped_existing"],
+                        "extracted_text_length": result["extracted_text_length"]
+                    }
+                }, 200)
+            else:
+                return ojsonify({
                     "success": False,
-                    "error": str(e),
-                    "message": "Failed to process the PDF file"
-                }), 500
-        else:
-            return jsonify({
+                    "error": result.get("error", "Unknown error"),
+                    "message": result.get("message", "Failed to process PDF")
+                }, 500)
+                
+        except Exception as e:
+            logger.error(f"Error processing PDF: {str(e)}")
+            return ojsonify({
                 "success": False,
-                "error": "Invalid file type",
-                "message": "Only PDF files are allowed"
-            }), 400
+                "error": str(e),
+                "message": "Failed to process the PDF file"
+            }, 500)
 
     except Exception as e:
         logger.error(f"Unexpected error in upload_pdf: {str(e)}")
-        return jsonify({
+        return ojsonify({
             "success": False,
             "error": str(e),
             "message": "An unexpected error occurred"
-        }), 500
+        }, 500)
 
 @app.route('/search-cv', methods=['POST'])
 def search_cv():
     """
     Search processed CV content
     
-    Expected JSON: {"query": "search query"}
-    Returns: Search results from Weaviate
+    Expected JSON: {"query": "search query", "limit": 10}
+    Returns: NDJSON stream, one {"uuid", "properties", "score"} object per line
     """
     try:
         data = request.get_json()
         
         if not data or 'query' not in data:
-            return jsonify({
+            return ojsonify({
                 "success": False,
                 "error": "Missing query parameter",
                 "message": "Please provide a search query"
-            }), 400
+            }, 400)
         
         query = data['query']
+        try:
+            limit = int(data.get('limit', DEFAULT_SEARCH_LIMIT))
+        except (TypeError, ValueError):
+            limit = None
+        if limit is None or not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return ojsonify({
+                "success": False,
+                "error": "Invalid limit parameter",
+                "message": f"limit must be an integer between 1 and {MAX_SEARCH_LIMIT}"
+            }, 400)
+        
+        vector = embed_query(query)
+        
+        # A recent query with the same keywords and a near-identical embedding
+        # already has its NDJSON lines cached
+        cache_key = (limit, _keyword_key(query))
+        cached_lines = search_cache.get(vector, key=cache_key)
+        if cached_lines is not None:
+            return ndjson_response([b"".join(cached_lines)])
+        
+        # Run the query before streaming so search errors still get a JSON 500
+        collection = get_weaviate_client().collections.get(COLLECTION_NAME)
+        response = collection.query.hybrid(
+            query=query,
+            vector=vector,
+            limit=limit,
+            return_metadata=MetadataQuery(score=True)
+        )
+        
+        def serialize(obj):
+            return orjson.dumps({
+                "uuid": obj.uuid,
+                "properties": obj.properties,
+                "score": obj.metadata.score
+            }) + b"\n"
+        
+        def generate():
+            # Serialize and send one hit at a time instead of building the whole body
+            lines = []
+            try:
+                for obj in response.objects:
+                    line = serialize(obj)
+                    lines.append(line)
+                    yield line
+            except GeneratorExit:
+                # The client went away mid-stream; still cache the full result
+                # so its retry doesn't go back to Weaviate
+                lines.extend(map(serialize, response.objects[len(lines):]))
+                search_cache.put(vector, lines, key=cache_key)
+                raise
+            search_cache.put(vector, lines, key=cache_key)
         
-        # TODO: Implement search functionality using weaviate_operations
-        # For now, return a placeholder response
-        return jsonify({
-            "success": True,
-            "message": "Search functionality coming soon",
-            "query": query,
-            "results": []
-        }), 200
+        return ndjson_response(generate())
         
     except Exception as e:
         logger.error(f"Error in search_cv: {str(e)}")
-        return jsonify({
+        return ojsonify({
             "success": False,
             "error": str(e),
             "message": "Failed to perform search"
-        }), 500
+        }, 500)
 
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
+# Serve with a production WSGI server rather than the Flask dev server, e.g.
+# from the backend directory:
+#   gunicorn -w 2 -k gthread --threads 4 -b 0.0.0.0:5001 api_server:app
+ 
\ No newline at end of file
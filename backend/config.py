@@ -2,8 +2,22 @@
 Configuration settings for Weaviate connection
 """
 import os
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
+from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.config import ConnectionConfig
+
+# Connection pool sizing, large enough for concurrent batch workers and requests
+SESSION_POOL_CONNECTIONS = 100
+SESSION_POOL_MAXSIZE = 100
+
+# Request timeouts in seconds; inserts get the longest so large gRPC batch
+# requests (and the server-side vectorization they trigger) can finish
+INIT_TIMEOUT = 30
+QUERY_TIMEOUT = 60
+INSERT_TIMEOUT = 180
 
 
 class WeaviateConfig(BaseSettings):
@@ -26,5 +40,32 @@ class WeaviateConfig(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-# Global config instance
-config = WeaviateConfig() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_config() -> WeaviateConfig:
+    """
+    Get the global config instance
+    
+    Settings (and the .env file) are only read on first call, so importing
+    this module doesn't require Weaviate credentials to be present.
+    """
+    return WeaviateConfig()
+
+
+def get_additional_config() -> AdditionalConfig:
+    """
+    Connection pool and timeout settings for Weaviate connections
+    
+    Pass as additional_config= to weaviate.connect_to_weaviate_cloud().
+    """
+    return AdditionalConfig(
+        connection=ConnectionConfig(
+            session_pool_connections=SESSION_POOL_CONNECTIONS,
+            session_pool_maxsize=SESSION_POOL_MAXSIZE
+        ),
+        timeout=Timeout(init=INIT_TIMEOUT, query=QUERY_TIMEOUT, insert=INSERT_TIMEOUT)
+    )
+
+
+def get_cache_dir() -> Path:
+    """Directory for on-disk caches (query embeddings, extracted PDF text)"""
+    return Path(os.environ.get("MIRA_CACHE_DIR", Path.home() / ".cache" / "mira"))
@@ -0,0 +1,167 @@
+"""
+Client-side OpenAI embeddings for Weaviate ingestion
+"""
+import atexit
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional
+import numpy as np
+import tiktoken
+from openai import OpenAI
+from dotenv import load_dotenv
+
+from config import get_cache_dir
+
+load_dotenv()
+
+# Must match the model configured on the collection's text2vec-openai vectorizer,
+# otherwise near_text queries and stored vectors live in different spaces
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_BATCH_SIZE = 512  # inputs per embeddings request
+EMBEDDING_CONCURRENCY = 2  # embeddings requests in flight at once
+QUERY_CACHE_SIZE = 1024  # query embeddings kept, least recently used evicted first
+QUERY_CACHE_FILE = "qembed.npz"  # in the cache directory
+
+_openai_client: Optional[OpenAI] = None
+
+# Query embeddings (float32) persisted across runs, keyed by SHA1 of model +
+# query, in least- to most-recently-used order
+_query_cache: Optional["OrderedDict[str, np.ndarray]"] = None
+_query_cache_dirty = False
+_query_cache_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """Get the shared OpenAI client, creating it on first use"""
+    global _openai_client
+    if _openai_client is None:
+        api_key = os.environ.get("OPENAI_APIKEY") or os.environ["OPEN_AI_API"]
+        _openai_client = OpenAI(api_key=api_key)
+    return _openai_client
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer() -> tiktoken.Encoding:
+    """
+    Tokenizer of EMBEDDING_MODEL, for sizing inputs in the units the API meters
+    
+    tiktoken downloads the model's BPE file on first use; unless
+    TIKTOKEN_CACHE_DIR is set, it is kept in the cache directory so later
+    processes (and offline restarts) load it from disk.
+    """
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(get_cache_dir() / "tiktoken"))
+    return tiktoken.encoding_for_model(EMBEDDING_MODEL)
+
+
+def iter_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> Iterator[List[float]]:
+    """
+    Embed texts in sub-batches, yielding vectors as soon as each request returns
+    
+    Up to EMBEDDING_CONCURRENCY requests run at once, so callers can push the
+    first vectors to Weaviate while later sub-batches are still being embedded.
+    
+    Args:
+        texts: Texts to embed
+        batch_size: Maximum number of inputs sent per request
+        
+    Yields:
+        One embedding per input text, in input order
+    """
+    client = get_openai_client()
+    batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+
+    def embed_batch(batch: List[str]):
+        return client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
+
+    with ThreadPoolExecutor(max_workers=EMBEDDING_CONCURRENCY) as executor:
+        for response in executor.map(embed_batch, batches):
+            for item in response.data:
+                yield item.embedding
+
+
+def embed_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+    """
+    Embed many texts with as few API calls as possible
+    
+    Args:
+        texts: Texts to embed
+        batch_size: Maximum number of inputs sent per request
+        
+    Returns:
+        One embedding per input text, in input order
+    """
+    return list(iter_embeddings(texts, batch_size))
+
+
+def _load_query_cache() -> "OrderedDict[str, np.ndarray]":
+    """Load the on-disk query embedding cache once; it is written back at exit"""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = OrderedDict()
+            try:
+                # Plain arrays only (no pickle), so a tampered file can't run code
+                with np.load(get_cache_dir() / QUERY_CACHE_FILE, allow_pickle=False) as data:
+                    keys, vectors = data["keys"], data["vectors"]
+                    for key, vector in zip(keys[-QUERY_CACHE_SIZE:], vectors[-QUERY_CACHE_SIZE:]):
+                        _query_cache[str(key)] = vector
+            except (OSError, ValueError, KeyError):
+                _query_cache.clear()
+            atexit.register(_save_query_cache)
+        return _query_cache
+
+
+def _save_query_cache() -> None:
+    """Write new query embeddings back to disk (best effort)"""
+    if not _query_cache_dirty or not _query_cache:
+        return
+    try:
+        cache_path = get_cache_dir() / QUERY_CACHE_FILE
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with _query_cache_lock:
+            keys = np.array(list(_query_cache.keys()))
+            vectors = np.stack(list(_query_cache.values()))
+        with open(tmp_path, "wb") as f:
+            np.savez(f, keys=keys, vectors=vectors)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+
+
+def embed_query(query: str) -> List[float]:
+    """
+    Embed a search query, reusing earlier embeddings of the same query
+    
+    Pass the result to near_vector / hybrid(vector=...) so Weaviate doesn't
+    call OpenAI again for repeated queries. Up to QUERY_CACHE_SIZE embeddings
+    are kept, as float32.
+    
+    Args:
+        query: Search query text
+        
+    Returns:
+        The query's embedding
+    """
+    global _query_cache_dirty
+    cache = _load_query_cache()
+    key = hashlib.sha1(f"{EMBEDDING_MODEL}\0{query}".encode()).hexdigest()
+    
+    with _query_cache_lock:
+        vector = cache.get(key)
+        if vector is not None:
+            cache.move_to_end(key)
+    if vector is None:
+        response = get_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=[query])
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        with _query_cache_lock:
+            cache[key] = vector
+            if len(cache) > QUERY_CACHE_SIZE:
+                cache.popitem(last=False)
+            _query_cache_dirty = True
+    # A list keeps the client's fast serialization path for hybrid(vector=...)
+    return vector.tolist()
@@ -0,0 +1,18 @@
+"""
+gunicorn settings, picked up automatically when gunicorn is started from this directory
+"""
+
+
+def on_starting(server):
+    """Fetch the tokenizer's BPE file once in the master, so workers read it from the cache"""
+    from embeddings import get_tokenizer
+    try:
+        get_tokenizer()
+    except Exception as e:
+        server.log.warning(f"Could not load the tokenizer, workers will try again on first use: {str(e)}")
+
+
+def post_worker_init(worker):
+    """Connect each worker to Weaviate (and start search warm-up) before it takes traffic"""
+    from api_server import get_weaviate_client
+    get_weaviate_client()
@@ -0,0 +1,110 @@
+"""
+Semantic cache for search results, keyed by query embedding similarity
+"""
+import threading
+import time
+from typing import Any, Hashable, List, Optional
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.95  # cosine similarity needed to reuse a cached result
+MAX_ENTRIES = 256  # cached queries kept; the oldest is overwritten when full
+ENTRY_TTL = 300  # seconds; bounds staleness when other processes add data
+
+
+class SemanticCache:
+    """
+    Reuse search results for queries whose embeddings are nearly identical
+
+    Query embeddings are stored L2-normalized in a fixed-size float32 matrix,
+    so a lookup is a single matrix-vector product. Entries only match when
+    their key (e.g. collection and limit) is equal to the lookup's key.
+    """
+
+    def __init__(self,
+                 threshold: float = SIMILARITY_THRESHOLD,
+                 max_entries: int = MAX_ENTRIES,
+                 ttl: float = ENTRY_TTL):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: List[Hashable] = []
+        self._results: List[Any] = []
+        self._stored_at: List[float] = []
+        self._next = 0  # slot the next entry is written to
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, vector, key: Hashable = None) -> Optional[Any]:
+        """
+        Look up results cached for a similar query
+
+        Args:
+            vector: Embedding of the new query
+            key: Extra lookup key that must match exactly
+
+        Returns:
+            The cached results, or None on a miss
+        """
+        query = self._normalize(vector)
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            count = len(self._keys)
+            if not count:
+                return None
+
+            similarities = self._vectors[:count] @ query
+            usable = np.fromiter(
+                (k == key and stored_at >= cutoff for k, stored_at in zip(self._keys, self._stored_at)),
+                dtype=bool,
+                count=count
+            )
+            similarities[~usable] = -1.0
+            best = int(similarities.argmax())
+            if similarities[best] >= self.threshold:
+                return self._results[best]
+            return None
+
+    def put(self, vector, results: Any, key: Hashable = None) -> None:
+        """
+        Cache results for a query
+
+        Args:
+            vector: Embedding of the query
+            results: Results to return for similar queries
+            key: Extra lookup key that must match exactly
+        """
+        query = self._normalize(vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                self._vectors = np.zeros((self.max_entries, query.shape[0]), dtype=np.float32)
+                self._clear()
+
+            slot = self._next
+            self._vectors[slot] = query
+            if slot == len(self._keys):
+                self._keys.append(key)
+                self._results.append(results)
+                self._stored_at.append(time.monotonic())
+            else:
+                self._keys[slot] = key
+                self._results[slot] = results
+                self._stored_at[slot] = time.monotonic()
+            self._next = (slot + 1) % self.max_entries
+
+    def _clear(self) -> None:
+        self._keys.clear()
+        self._results.clear()
+        self._stored_at.clear()
+        self._next = 0
+
+    def clear(self) -> None:
+        """Drop all cached results, e.g. after new data was stored"""
+        with self._lock:
+            self._clear()
@@ -3,19 +3,23 @@ Test function to upload PDF content to Weaviate
 """
 import os
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from pathlib import Path
-import PyPDF2
+import pymupdf
+import xxhash
+from weaviate.util import generate_uuid5
 from datetime import datetime
 
+from embeddings import EMBEDDING_MODEL
+from test_pdf_upload_fixed import chunk_text
+
 # Import our Weaviate functions
 from weaviate_client import weaviate_connection
 from weaviate_operations import (
-    create_collection,
-    insert_object,
+    ensure_collection,
     batch_insert,
-    semantic_search,
-    collection_exists
+    semantic_search
 )
 
 # Configure logging
@@ -34,84 +38,31 @@ def extract_pdf_text(pdf_path: str) -> str:
         Extracted text content
     """
     try:
-        text_content = ""
+        parts: List[str] = []
         
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            for page_num, page in enumerate(pdf_reader.pages):
+        doc = pymupdf.open(pdf_path)
+        try:
+            for page_num, page in enumerate(doc):
+                # Scanned/image-only pages have no fonts, so there is no text to extract
+                if not page.get_fonts():
+                    continue
                 try:
-                    page_text = page.extract_text()
+                    page_text = page.get_text("text")
                     if page_text.strip():
-                        text_content += f"\n--- Page {page_num + 1} ---\n"
-                        text_content += page_text
+                        parts.append(f"\n--- Page {page_num + 1} ---\n")
+                        parts.append(page_text)
                 except Exception as e:
                     logger.warning(f"Could not extract text from page {page_num + 1}: {e}")
+        finally:
+            doc.close()
         
-        return text_content.strip()
+        return "".join(parts).strip()
         
     except Exception as e:
         logger.error(f"Failed to extract text from PDF: {e}")
         raise
 
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict[str, Any]]:
-    """
-    Split text into overlapping chunks
-    
-    Args:
-        text: Text to chunk
-        chunk_size: Maximum characters per chunk
-        overlap: Characters to overlap between chunks
-        
-    Returns:
-        List of text chunks with metadata
-    """
-    chunks = []
-    words = text.split()
-    
-    if not words:
-        return chunks
-    
-    current_chunk = []
-    current_length = 0
-    chunk_id = 0
-    
-    for word in words:
-        word_length = len(word) + 1  # +1 for space
-        
-        if current_length + word_length > chunk_size and current_chunk:
-            # Create chunk
-            chunk_text = ' '.join(current_chunk)
-            chunks.append({
-                "chunk_id": chunk_id,
-                "text": chunk_text,
-                "length": len(chunk_text),
-                "word_count": len(current_chunk)
-            })
-            
-            # Start new chunk with overlap
-            overlap_words = current_chunk[-overlap//10:] if overlap > 0 else []
-            current_chunk = overlap_words + [word]
-            current_length = sum(len(w) + 1 for w in current_chunk)
-            chunk_id += 1
-        else:
-            current_chunk.append(word)
-            current_length += word_length
-    
-    # Add final chunk
-    if current_chunk:
-        chunk_text = ' '.join(current_chunk)
-        chunks.append({
-            "chunk_id": chunk_id,
-            "text": chunk_text,
-            "length": len(chunk_text),
-            "word_count": len(current_chunk)
-        })
-    
-    return chunks
-
-
 def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/backend/cv-front-end.pdf"):
     """
     Test function to upload PDF content to Weaviate
@@ -144,30 +95,29 @@ def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/
         # Step 2: Create collection if it doesn't exist
         print(f"\n🗄️ Setting up collection: {collection_name}")
         
-        if not collection_exists(collection_name):
-            success = create_collection(
-                name=collection_name,
-                properties=[
-                    {"name": "title", "type": "text"},
-                    {"name": "content", "type": "text"},
-                    {"name": "chunk_id", "type": "int"},
-                    {"name": "source_file", "type": "text"},
-                    {"name": "file_size", "type": "int"},
-                    {"name": "upload_date", "type": "date"},
-                    {"name": "chunk_length", "type": "int"},
-                    {"name": "word_count", "type": "int"}
-                ],
-                vectorizer="text2vec-openai",
-                generative_model="gpt-3.5-turbo"
-            )
-            
-            if success:
-                print(f"✅ Created collection: {collection_name}")
-            else:
-                print(f"❌ Failed to create collection: {collection_name}")
-                return False
+        success = ensure_collection(
+            name=collection_name,
+            properties=[
+                {"name": "title", "type": "text"},
+                {"name": "content", "type": "text"},
+                {"name": "chunk_id", "type": "int"},
+                {"name": "source_file", "type": "text"},
+                {"name": "file_size", "type": "int"},
+                {"name": "upload_date", "type": "date"},
+                {"name": "chunk_length", "type": "int"},
+                {"name": "word_count", "type": "int"}
+            ],
+            vectorizer="text2vec-openai",
+            generative_model="gpt-3.5-turbo",
+            vectorizer_model=EMBEDDING_MODEL,
+            vectorize_collection_name=False
+        )
+        
+        if success:
+            print(f"✅ Collection ready: {collection_name}")
         else:
-            print(f"✅ Collection already exists: {collection_name}")
+            print(f"❌ Failed to create collection: {collection_name}")
+            return False
         
         # Step 3: Chunk the text
         print("\n✂️ Chunking text...")
@@ -181,9 +131,15 @@ def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/
         file_size = pdf_file.stat().st_size
         upload_date = datetime.now().isoformat()
         
-        documents = []
+        # Content-addressed UUIDs: identical chunks (repeat uploads, or repeats
+        # within this PDF) map to one object and are only vectorized once
+        documents = {}
         for chunk in chunks:
-            doc = {
+            uuid = generate_uuid5(xxhash.xxh64(chunk["text"].encode("utf-8")).hexdigest())
+            if uuid in documents:
+                continue
+            documents[uuid] = {
+                "uuid": uuid,
                 "properties": {
                     "title": f"{pdf_file.stem} - Chunk {chunk['chunk_id'] + 1}",
                     "content": chunk["text"],
@@ -195,7 +151,7 @@ def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/
                     "word_count": chunk["word_count"]
                 }
             }
-            documents.append(doc)
+        documents = list(documents.values())
         
         # Step 5: Upload to Weaviate
         print(f"\n🚀 Uploading {len(documents)} documents to Weaviate...")
@@ -203,12 +159,15 @@ def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/
         results = batch_insert(
             collection_name=collection_name,
             objects=documents,
-            batch_size=10
+            batch_size=200,
+            skip_existing=True,
+            embed_property="content"
         )
         
         print(f"✅ Upload complete!")
         print(f"   • Successful: {results['inserted']}")
         print(f"   • Failed: {results['failed']}")
+        print(f"   • Already stored: {results['skipped']}")
         print(f"   • Total: {results['total']}")
         
         # Step 6: Test search functionality
@@ -221,14 +180,20 @@ def test_pdf_upload(pdf_path: str = "/Users/vladyslavaka/Documents/mira-ailyser/
             "education"
         ]
         
-        for query in search_queries:
+        # The queries are independent, so run them concurrently and print in order
+        with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+            all_results = list(executor.map(
+                lambda query: semantic_search(
+                    collection_name=collection_name,
+                    query=query,
+                    limit=3,
+                    properties=["title", "content", "chunk_id"]
+                ),
+                search_queries
+            ))
+        
+        for query, search_results in zip(search_queries, all_results):
             print(f"\nSearching for: '{query}'")
-            search_results = semantic_search(
-                collection_name=collection_name,
-                query=query,
-                limit=3,
-                properties=["title", "content", "chunk_id"]
-            )
             
             if search_results:
                 print(f"  Found {len(search_results)} results:")
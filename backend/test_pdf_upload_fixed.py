@@ -1,54 +1,98 @@
 import weaviate
 from weaviate.classes.init import Auth
+import io
+import itertools
+import mmap
+import multiprocessing
 import os
+import re
+import threading
+import numpy as np
+import xxhash
+import zstandard as zstd
+from concurrent.futures import ProcessPoolExecutor
 from weaviate.classes.config import Configure, Property, DataType
+from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
+import pymupdf
 from pypdf import PdfReader
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union, BinaryIO
 from dotenv import load_dotenv
 
+from config import get_additional_config, get_cache_dir
+from embeddings import EMBEDDING_MODEL, get_tokenizer, iter_embeddings
+
 
 load_dotenv()
 
-# Best practice: store your credentials in environment variables
-weaviate_url = os.environ["WEAVIATE_URL"]
-weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
-open_ai_key = os.environ["OPEN_AI_API"]
-
-headers = {
-    "X-OpenAI-Api-Key": open_ai_key,
-}
-client = weaviate.connect_to_weaviate_cloud(
-    cluster_url=weaviate_url,                       # `weaviate_url`: your Weaviate URL
-    auth_credentials=Auth.api_key(weaviate_api_key),      # `weaviate_key`: your Weaviate API key
-    headers=headers
-)
-
-print(client.is_ready())  # Should print: `True`
-
-# Try to get existing collection or create new one
-try:
-    pdf_for_mira = client.collections.get("Pdf_for_mira")
-    print("Using existing Pdf_for_mira collection")
-except:
+_WORD_RE = re.compile(r"\S+")
+
+# A PDF can be handed over as a filesystem path, its raw bytes, or a binary file object
+PdfSource = Union[str, bytes, BinaryIO]
+
+COLLECTION_NAME = "Pdf_for_mira"
+BATCH_SIZE = 500  # objects per batch request
+BATCH_CONCURRENT_REQUESTS = 4  # batch requests in flight at once
+EXISTENCE_CHECK_BATCH_SIZE = 1000  # UUIDs per "already stored?" query
+CHUNK_SIZE_TOKENS = 256  # about the 1000 characters chunks used to be
+CHUNK_OVERLAP_TOKENS = 50
+SQ_TRAINING_LIMIT = 10000  # vectors stored before scalar quantization is trained
+MIN_FAST_PATH_TEXT_LENGTH = 100  # chars; below this, retry extraction with pypdf
+TEXT_CACHE_VERSION = 1  # bump when extraction output changes, to ignore old cache entries
+PARALLEL_EXTRACTION_MIN_PAGES = 64  # smaller PDFs aren't worth starting worker processes for
+EXTRACTION_WORKERS = os.cpu_count() or 1
+MAX_REPORTED_SKIPPED_PAGES = 10  # page numbers listed when pages without text are skipped
+
+# Worker processes for extracting large PDFs, see _get_extraction_pool()
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+# Lazily created client for callers that don't pass their own (scripts, legacy entry point)
+_default_client = None
+
+
+def ensure_pdf_collection(client: weaviate.WeaviateClient):
+    """
+    Get the Pdf_for_mira collection, creating it if it doesn't exist
+    
+    Args:
+        client: Connected Weaviate client
+        
+    Returns:
+        Collection handle
+    """
+    # Try to get existing collection or create new one
+    if client.collections.exists(COLLECTION_NAME):
+        print(f"Using existing {COLLECTION_NAME} collection")
+        return client.collections.get(COLLECTION_NAME)
+
     # Create collection if it doesn't exist
     try:
-        pdf_for_mira = client.collections.create(
-            name="Pdf_for_mira",
+        collection = client.collections.create(
+            name=COLLECTION_NAME,
             properties=[
                 Property(name="text", data_type=DataType.TEXT),
                 Property(name="chunk_id", data_type=DataType.INT),
                 Property(name="length", data_type=DataType.INT),
                 Property(name="word_count", data_type=DataType.INT),
             ],
-            # Use the text2vec-openai vectorizer
-            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_openai()
+            # Use the text2vec-openai vectorizer (same model we embed chunks with client-side)
+            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_openai(
+                model=EMBEDDING_MODEL,
+                vectorize_collection_name=False
+            ),
+            # Scalar-quantize vectors to 8 bits per dimension once enough are stored;
+            # results are rescored against the full vectors
+            vector_index_config=Configure.VectorIndex.hnsw(
+                quantizer=Configure.VectorIndex.Quantizer.sq(training_limit=SQ_TRAINING_LIMIT)
+            )
         )
-        print("Created new Pdf_for_mira collection")
+        print(f"Created new {COLLECTION_NAME} collection")
     except Exception as e:
         print(f"Error creating collection: {e}")
         # If that fails too, try without vectorizer config
-        pdf_for_mira = client.collections.create(
-            name="Pdf_for_mira",
+        collection = client.collections.create(
+            name=COLLECTION_NAME,
             properties=[
                 Property(name="text", data_type=DataType.TEXT),
                 Property(name="chunk_id", data_type=DataType.INT),
@@ -57,134 +101,532 @@ except:
             ]
         )
         print("Created collection without vectorizer config")
+    return collection
+
+
+def connect_client() -> weaviate.WeaviateClient:
+    """
+    Open a Weaviate Cloud connection and make sure the PDF collection exists
+    
+    The returned client is meant to be long-lived: create it once per process
+    and pass it to process_user_pdf() instead of reconnecting for every PDF.
+    
+    Returns:
+        Connected Weaviate client
+    """
+    # Best practice: store your credentials in environment variables
+    weaviate_url = os.environ["WEAVIATE_URL"]
+    weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
+    open_ai_key = os.environ["OPEN_AI_API"]
+
+    headers = {
+        "X-OpenAI-Api-Key": open_ai_key,
+    }
+    client = weaviate.connect_to_weaviate_cloud(
+        cluster_url=weaviate_url,                       # `weaviate_url`: your Weaviate URL
+        auth_credentials=Auth.api_key(weaviate_api_key),      # `weaviate_key`: your Weaviate API key
+        headers=headers,
+        additional_config=get_additional_config()
+    )
+
+    print(client.is_ready())  # Should print: `True`
+
+    ensure_pdf_collection(client)
+    return client
+
+
+def get_client() -> weaviate.WeaviateClient:
+    """Get the module's shared client, connecting on first use"""
+    global _default_client
+    if _default_client is None:
+        _default_client = connect_client()
+    return _default_client
+
+
+def _open_pdf(pdf_source: Union[str, bytes]) -> pymupdf.Document:
+    """Open a PDF from a path or from its raw bytes"""
+    if isinstance(pdf_source, bytes):
+        return pymupdf.open(stream=pdf_source, filetype="pdf")
+    return pymupdf.open(pdf_source)
+
+
+def _iter_page_texts(doc: pymupdf.Document, first: int = 0, last: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of pages [first, last), skipping pages without a text layer
+    
+    Pages are judged by their extracted text rather than their font list:
+    text drawn from Form XObjects or with inherited font resources can leave
+    get_fonts() empty. Skipped pages (e.g. scanned images) are reported.
+    """
+    skipped = []
+    for page in doc.pages(first, last):
+        text = page.get_text("text")
+        if text.strip():
+            yield text
+        else:
+            skipped.append(page.number + 1)
+    if skipped:
+        shown = ", ".join(map(str, skipped[:MAX_REPORTED_SKIPPED_PAGES]))
+        more = f" and {len(skipped) - MAX_REPORTED_SKIPPED_PAGES} more" if len(skipped) > MAX_REPORTED_SKIPPED_PAGES else ""
+        print(f"Skipped {len(skipped)} page(s) without a text layer (scanned?): {shown}{more}")
+
+
+def _page_range_text(doc: pymupdf.Document, first: int, last: int) -> str:
+    """Text of pages [first, last), skipping pages without a text layer"""
+    return "\n".join(_iter_page_texts(doc, first, last))
+
+
+def _extract_page_range(pdf_source: str, first: int, last: int) -> str:
+    """Worker entry point: each process opens its own Document, they can't be shared"""
+    doc = _open_pdf(pdf_source)
+    try:
+        return _page_range_text(doc, first, last)
+    finally:
+        doc.close()
 
 
-def extract_pdf_text(pdf_path: str) -> str:
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """
+    Shared worker pool for page-range extraction, started on first use
+    
+    Workers come from a forkserver (or are spawned) rather than forked from
+    this process, so they don't inherit its gRPC channel or its threads.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _extraction_pool
+
+
+def _iter_text_pymupdf(pdf_source: Union[str, bytes]) -> Iterator[str]:
+    """
+    Fast path: yield page text from PyMuPDF's C (MuPDF) text layer
+    
+    Large PDFs given as a path are split into contiguous page ranges
+    extracted in worker processes; MuPDF holds the GIL and its documents
+    aren't thread-safe. Each range's text is yielded as soon as it (and those
+    before it) finish. PDFs given as bytes (API uploads, at most 16MB) are
+    read in-process rather than copied to every worker.
+    """
+    doc = _open_pdf(pdf_source)
+    try:
+        page_count = doc.page_count
+        if (isinstance(pdf_source, bytes)
+                or page_count < PARALLEL_EXTRACTION_MIN_PAGES
+                or EXTRACTION_WORKERS < 2):
+            yield from _iter_page_texts(doc)
+            return
+    finally:
+        doc.close()
+    
+    step = -(-page_count // EXTRACTION_WORKERS)
+    firsts = range(0, page_count, step)
+    lasts = [min(first + step, page_count) for first in firsts]
+    pool = _get_extraction_pool()
+    for text in pool.map(_extract_page_range, itertools.repeat(pdf_source), firsts, lasts):
+        if text:
+            yield text
+
+
+def _extract_text_pypdf(pdf_source: PdfSource) -> str:
+    """Slow path: pure-Python extraction, copes with some PDFs MuPDF reads poorly"""
+    reader = PdfReader(io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source)
+    return "".join(page.extract_text() for page in reader.pages)
+
+
+def _iter_pdf_text_uncached(pdf_source: Union[str, bytes]) -> Iterator[str]:
+    """
+    Yield a PDF's text page by page
+    
+    Uses PyMuPDF first and only falls back to pypdf when it returns almost no
+    text (e.g. image-heavy or oddly encoded PDFs). Pages are held back only
+    until MIN_FAST_PATH_TEXT_LENGTH characters have been seen.
+    """
+    pages = _iter_text_pymupdf(pdf_source)
+    held_back = []
+    held_back_length = 0
+    for text in pages:
+        held_back.append(text)
+        held_back_length += len(text.strip())
+        if held_back_length >= MIN_FAST_PATH_TEXT_LENGTH:
+            yield from held_back
+            yield from pages
+            return
+    
+    fallback_text = _extract_text_pypdf(pdf_source)
+    if len(fallback_text.strip()) > held_back_length:
+        yield fallback_text
+    else:
+        yield from held_back
+
+
+def _pdf_digest(pdf_source: Union[str, bytes]) -> str:
+    """
+    Fast content hash of a PDF given as a path or raw bytes
+    
+    Files are memory-mapped and hashed in place, so even very large PDFs are
+    paged in by the kernel on demand instead of being copied into Python.
+    """
+    digest = xxhash.xxh3_128()
+    if isinstance(pdf_source, bytes):
+        digest.update(pdf_source)
+    else:
+        with open(pdf_source, "rb") as f:
+            # mmap can't map an empty file
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+    return digest.hexdigest()
+
+
+def iter_pdf_text(pdf_source: PdfSource) -> Iterator[str]:
+    """
+    Yield a PDF's text page by page, from the on-disk text cache when possible
+    
+    Extracted text is cached zstd-compressed, keyed by a hash of the PDF's
+    content, so re-processing the same PDF skips extraction entirely. The
+    cache entry is only written once extraction ran to completion.
+    
+    Args:
+        pdf_source: Path to the PDF file, its raw bytes, or a binary file object
+        
+    Yields:
+        Text pieces which, joined with newlines, make up the document's text
+    """
+    # Both extractors may need to read the data, so read file objects once
+    if not isinstance(pdf_source, (str, bytes)):
+        pdf_source = pdf_source.read()
+    
+    cache_path = get_cache_dir() / "pdftext" / f"{_pdf_digest(pdf_source)}-v{TEXT_CACHE_VERSION}.txt.zst"
+    try:
+        cached = open(cache_path, "rb")
+    except OSError:
+        pass
+    else:
+        # Cached text is stored newline-joined, so its lines are valid pieces
+        with cached, zstd.ZstdDecompressor().stream_reader(cached) as reader:
+            line = ""
+            for line in io.TextIOWrapper(reader, encoding="utf-8", newline="\n"):
+                yield line[:-1] if line.endswith("\n") else line
+            if line.endswith("\n"):
+                yield ""
+        return
+    
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        yield from _iter_pdf_text_uncached(pdf_source)
+        return
+    
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    complete = False
+    try:
+        with open(tmp_path, "wb") as raw, zstd.ZstdCompressor().stream_writer(raw) as writer:
+            separator = b""
+            for text in _iter_pdf_text_uncached(pdf_source):
+                writer.write(separator + text.encode("utf-8"))
+                separator = b"\n"
+                yield text
+        complete = True
+    finally:
+        if complete:
+            os.replace(tmp_path, cache_path)
+        else:
+            tmp_path.unlink(missing_ok=True)
+
+
+def extract_pdf_text(pdf_source: PdfSource) -> str:
     """
     Extract text content from PDF file
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_source: Path to the PDF file, its raw bytes, or a binary file object
         
     Returns:
         Extracted text content
     """
     try:
-        text_content = ""
-        
-        reader = PdfReader(pdf_path)
-        pages = reader.pages
-        for page in pages:
-            text_content += page.extract_text()
-        
+        text_content = "\n".join(iter_pdf_text(pdf_source)).strip()
         print(f"Extracted {len(text_content)} characters from PDF")
-        return text_content.strip()
+        return text_content
         
     except Exception as e:
         print(f"Failed to extract text from PDF: {e}")
         raise
 
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict[str, Any]]:
+def iter_chunks(pieces: Iterable[str],
+                chunk_size: int = CHUNK_SIZE_TOKENS,
+                overlap: int = CHUNK_OVERLAP_TOKENS) -> Iterator[Dict[str, Any]]:
     """
-    Split text into overlapping chunks
+    Split a stream of text pieces (e.g. pages) into overlapping chunks
+    
+    Chunks are sized in embedding-model tokens, so none is truncated by the
+    embeddings API, but always end on word boundaries. Chunks may span piece
+    boundaries; only the words the next chunk can still use are kept between
+    pieces, so memory stays bounded by a page plus a chunk. Boundaries are
+    found with prefix sums over per-word token counts.
     
     Args:
-        text: Text to chunk
-        chunk_size: Maximum characters per chunk
-        overlap: Characters to overlap between chunks
+        pieces: Text pieces, treated as joined with newlines
+        chunk_size: Maximum tokens per chunk (a single longer word is kept whole)
+        overlap: Maximum tokens (whole words) repeated from the end of the
+            previous chunk
         
-    Returns:
-        List of text chunks with metadata
+    Yields:
+        Text chunks with metadata, including the chunk's token count and its
+        start/end character offsets in the joined text
+        
+    Raises:
+        ValueError: Unless 0 <= overlap < chunk_size; a larger overlap would
+            grow each chunk by a word instead of moving forward
     """
-    chunks = []
-    words = text.split()
-    
-    if not words:
-        return chunks
-    
-    current_chunk = []
-    current_length = 0
+    if not 0 <= overlap < chunk_size:
+        raise ValueError(f"overlap must be at least 0 and less than chunk_size, got overlap={overlap}, chunk_size={chunk_size}")
+    tokenizer = get_tokenizer()
+    words: List[str] = []
+    spans = np.empty((0, 2), dtype=np.int64)
+    word_tokens = np.empty(0, dtype=np.int64)
+    offset = 0  # where the next piece starts in the joined text
+    start = 0
+    min_end = 1  # every chunk takes at least one word it didn't share with the previous one
     chunk_id = 0
     
-    for word in words:
-        word_length = len(word) + 1  # +1 for space
+    # A trailing None marks the end of input, when the last chunk may be emitted
+    for piece in itertools.chain(pieces, (None,)):
+        final = piece is None
+        if not final:
+            piece_words = _WORD_RE.findall(piece)
+            words.extend(piece_words)
+            piece_spans = np.fromiter(
+                (position for match in _WORD_RE.finditer(piece) for position in match.span()),
+                dtype=np.int64
+            ).reshape(-1, 2)
+            spans = np.concatenate((spans, piece_spans + offset))
+            # Words are joined with single spaces, so " word" is how each one is tokenized
+            # (encode_ordinary_batch would dispatch one thread-pool task per word)
+            piece_tokens = map(tokenizer.encode_ordinary, [" " + word for word in piece_words])
+            word_tokens = np.concatenate((
+                word_tokens,
+                np.fromiter(map(len, piece_tokens), dtype=np.int64, count=len(piece_words))
+            ))
+            offset += len(piece) + 1
+        
+        if start >= len(words):
+            continue
         
-        if current_length + word_length > chunk_size and current_chunk:
-            # Create chunk
-            chunk_text = ' '.join(current_chunk)
-            chunks.append({
+        # Cumulative token counts give the size of any word range in O(1)
+        word_ends = np.cumsum(word_tokens)
+        
+        while True:
+            consumed = word_ends[start - 1] if start else 0
+            end = max(int(np.searchsorted(word_ends, consumed + chunk_size, side="right")), min_end)
+            
+            # A chunk reaching the last word seen so far could still grow
+            if end >= len(words) and not final:
+                break
+            
+            chunk_text = ' '.join(words[start:end])
+            yield {
                 "chunk_id": chunk_id,
                 "text": chunk_text,
                 "length": len(chunk_text),
-                "word_count": len(current_chunk)
-            })
+                "word_count": end - start,
+                "token_count": int(word_ends[end - 1] - consumed),
+                "start": int(spans[start, 0]),
+                "end": int(spans[end - 1, 1])
+            }
+            
+            if end >= len(words):
+                break
             
-            # Start new chunk with overlap
-            overlap_words = current_chunk[-overlap//10:] if overlap > 0 else []
-            current_chunk = overlap_words + [word]
-            current_length = sum(len(w) + 1 for w in current_chunk)
+            # Start new chunk with the trailing words that fit in `overlap` tokens
+            overlap_from = word_ends[end - 1] - overlap
+            if overlap_from > 0:
+                start = max(int(np.searchsorted(word_ends, overlap_from, side="left")) + 1, start)
+            min_end = end + 1
             chunk_id += 1
-        else:
-            current_chunk.append(word)
-            current_length += word_length
+        
+        # Drop words no later chunk can include
+        if start:
+            del words[:start]
+            spans = spans[start:]
+            word_tokens = word_tokens[start:]
+            min_end -= start
+            start = 0
+
+
+def chunk_text(text: str,
+               chunk_size: int = CHUNK_SIZE_TOKENS,
+               overlap: int = CHUNK_OVERLAP_TOKENS) -> List[Dict[str, Any]]:
+    """
+    Split text into overlapping, token-sized chunks
     
-    # Add final chunk
-    if current_chunk:
-        chunk_text = ' '.join(current_chunk)
-        chunks.append({
-            "chunk_id": chunk_id,
-            "text": chunk_text,
-            "length": len(chunk_text),
-            "word_count": len(current_chunk)
-        })
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum tokens per chunk
+        overlap: Maximum tokens (whole words) repeated from the end of the
+            previous chunk
+        
+    Returns:
+        List of text chunks with metadata, including the chunk's token count
+        and start/end character offsets in the input text
+        
+    Raises:
+        ValueError: Unless 0 <= overlap < chunk_size
+    """
+    return list(iter_chunks([text], chunk_size, overlap))
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Group an iterable into lists of up to `size` items"""
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def chunk_uuid(text: str) -> str:
+    """Deterministic object UUID for a chunk, derived from a fast hash of its text"""
+    return generate_uuid5(xxhash.xxh64(text.encode("utf-8")).hexdigest())
+
+
+def find_existing_uuids(collection, uuids: List[str]) -> set:
+    """
+    Find which of the given object UUIDs are already stored
     
-    return chunks
+    Args:
+        collection: Collection to check
+        uuids: Candidate object UUIDs
+        
+    Returns:
+        Set of UUIDs (as strings) that already exist
+    """
+    existing = set()
+    for start in range(0, len(uuids), EXISTENCE_CHECK_BATCH_SIZE):
+        batch_uuids = uuids[start:start + EXISTENCE_CHECK_BATCH_SIZE]
+        response = collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(batch_uuids),
+            limit=len(batch_uuids),
+            return_properties=[]
+        )
+        existing.update(str(obj.uuid) for obj in response.objects)
+    return existing
 
 
-def process_user_pdf(pdf_path: str) -> Dict[str, Any]:
+def process_user_pdf(pdf_source: PdfSource, client: Optional[weaviate.WeaviateClient] = None) -> Dict[str, Any]:
     """
     Process a user-uploaded PDF file and upload to Weaviate
     
     Args:
-        pdf_path: Path to the user-uploaded PDF file
+        pdf_source: The user-uploaded PDF as a path, raw bytes, or binary file object
+        client: Connected Weaviate client to reuse (defaults to the module's shared client)
         
     Returns:
         Processing results with success status and details
     """
     try:
-        pdf_for_mira = client.collections.get("Pdf_for_mira")
+        if client is None:
+            client = get_client()
+        pdf_for_mira = client.collections.get(COLLECTION_NAME)
 
-        with pdf_for_mira.batch.fixed_size(batch_size=200) as batch:
-            # Extract text and chunk it
-            extracted_text = extract_pdf_text(pdf_path)
-            chunks = chunk_text(extracted_text)
-            
-            # Add chunks to batch
-            for chunk in chunks:
-                batch.add_object({
-                    "text": chunk["text"],
-                    "chunk_id": chunk["chunk_id"],
-                    "length": chunk["length"],
-                    "word_count": chunk["word_count"],
-                })
+        # Pages -> chunks -> Weaviate without materializing the whole text or
+        # chunk list: extraction, embedding and inserts overlap
+        extracted_text_length = 0
+
+        def pages():
+            # Length of the newline-joined text with surrounding whitespace
+            # stripped (as extract_pdf_text returns it), however it was split
+            # into pieces: whitespace only counts once more text follows it
+            nonlocal extracted_text_length
+            pending_whitespace = None  # None until the first non-whitespace text
+            for index, text in enumerate(iter_pdf_text(pdf_source)):
+                yield text
+                if pending_whitespace is None:
+                    piece = text.lstrip()
+                    if not piece:
+                        continue
+                    pending_whitespace = 0
+                else:
+                    piece = "\n" + text
+                content = piece.rstrip()
+                if content:
+                    extracted_text_length += pending_whitespace + len(content)
+                    pending_whitespace = len(piece) - len(content)
+                else:
+                    pending_whitespace += len(piece)
+
+        total_chunks = 0
+        new_chunk_count = 0
+        queued_count = 0
+        seen_uuids = set()
+
+        # Stream chunks to Weaviate in batches; the batcher sends them on
+        # background threads instead of one insert round-trip per chunk
+        with pdf_for_mira.batch.fixed_size(
+            batch_size=BATCH_SIZE,
+            concurrent_requests=BATCH_CONCURRENT_REQUESTS
+        ) as batch:
+            for chunks in _batched(iter_chunks(pages()), EXISTENCE_CHECK_BATCH_SIZE):
+                total_chunks += len(chunks)
+
+                # Content-addressed UUIDs: chunks already stored (e.g. from an earlier
+                # upload of the same CV) are skipped before any embedding work
+                chunk_uuids = [chunk_uuid(chunk["text"]) for chunk in chunks]
+                seen_uuids.update(find_existing_uuids(
+                    pdf_for_mira, [uuid for uuid in chunk_uuids if uuid not in seen_uuids]
+                ))
+                new_chunks = []
+                for chunk, uuid in zip(chunks, chunk_uuids):
+                    if uuid not in seen_uuids:
+                        seen_uuids.add(uuid)
+                        new_chunks.append((chunk, uuid))
+                new_chunk_count += len(new_chunks)
+
+                # Embed chunks in a few bulk requests; passing the vectors explicitly
+                # stops Weaviate from calling OpenAI once per object. Vectors are
+                # consumed as they arrive, so inserts overlap with later embedding calls
+                vectors = iter_embeddings([chunk["text"] for chunk, _ in new_chunks])
+
+                for (chunk, uuid), vector in zip(new_chunks, vectors):
+                    batch.add_object(
+                        properties={
+                            "text": chunk["text"],
+                            "chunk_id": chunk["chunk_id"],
+                            "length": chunk["length"],
+                            "word_count": chunk["word_count"],
+                        },
+                        uuid=uuid,
+                        vector=vector
+                    )
+                    queued_count += 1
+                    
+                    if batch.number_errors > 10:
+                        break
                 
                 if batch.number_errors > 10:
                     print("Batch import stopped due to excessive errors.")
                     break
 
+        print(f"Extracted {extracted_text_length} characters from PDF")
+
         # Check for failed objects
         failed_objects = pdf_for_mira.batch.failed_objects
         failed_count = len(failed_objects) if failed_objects else 0
-        success_count = len(chunks) - failed_count
+        success_count = queued_count - failed_count
         
         result = {
             "success": True,
-            "total_chunks": len(chunks),
+            "total_chunks": total_chunks,
             "successful_uploads": success_count,
             "failed_uploads": failed_count,
-            "extracted_text_length": len(extracted_text),
-            "message": f"Successfully processed PDF with {len(chunks)} chunks"
+            "skipped_existing": total_chunks - new_chunk_count,
+            "extracted_text_length": extracted_text_length,
+            "message": f"Successfully processed PDF with {total_chunks} chunks"
         }
         
         if failed_objects:
@@ -1,152 +1,210 @@
 """
 View PDF content stored in Weaviate
 """
+import atexit
 import os
+from functools import lru_cache
+
 import weaviate
 from weaviate.classes.init import Auth
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.aggregate import Metrics
+from weaviate.classes.config import Vectorizers
+from weaviate.classes.query import MetadataQuery, Sort
 from dotenv import load_dotenv
 
+from config import get_additional_config
+from embeddings import EMBEDDING_MODEL, embed_query
+from search_cache import SemanticCache
+
 load_dotenv()
 
+PAGE_SIZE = 10  # chunks fetched and shown per page in the viewer
+MAX_SUMMARY_SOURCE_FILES = 100  # distinct source files listed in the summary
+LIST_PROPERTIES = ("chunk_id", "title", "source_file", "word_count", "chunk_length")
+CONTENT_PROPERTIES = ("content", "text")  # chunk body, depending on the collection's schema
+
+# Results of recent searches, reused for near-identical queries
+_search_cache = SemanticCache()
+
+
+@lru_cache(maxsize=1)
+def get_client() -> weaviate.WeaviateClient:
+    """Connect once and share the client across viewer calls; closed at exit"""
+    weaviate_url = os.environ["WEAVIATE_URL"]
+    weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
+    openai_key = os.environ.get("OPENAI_APIKEY") or os.environ.get("OPEN_AI_API")
+    
+    headers = {"X-OpenAI-Api-Key": openai_key}
+    
+    client = weaviate.connect_to_weaviate_cloud(
+        cluster_url=weaviate_url,
+        auth_credentials=Auth.api_key(weaviate_api_key),
+        headers=headers,
+        additional_config=get_additional_config()
+    )
+    atexit.register(client.close)
+    return client
+
+
+def _property_names(collection) -> set:
+    """Names of the properties defined in a collection's schema"""
+    return {prop.name for prop in collection.config.get().properties}
+
 
 def view_all_pdf_chunks(collection_name="Pdf_for_mira", limit=50):
     """View all PDF chunks stored in Weaviate"""
     
     try:
-        # Connect to Weaviate
-        weaviate_url = os.environ["WEAVIATE_URL"]
-        weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
-        openai_key = os.environ.get("OPENAI_APIKEY") or os.environ.get("OPEN_AI_API")
+        client = get_client()
         
-        headers = {"X-OpenAI-Api-Key": openai_key}
+        print(f"📖 Viewing stored content from collection: {collection_name}")
+        print("=" * 80)
         
-        client = weaviate.connect_to_weaviate_cloud(
-            cluster_url=weaviate_url,
-            auth_credentials=Auth.api_key(weaviate_api_key),
-            headers=headers
-        )
+        collection = client.collections.get(collection_name)
         
-        try:
-            print(f"📖 Viewing stored content from collection: {collection_name}")
-            print("=" * 80)
-            
-            collection = client.collections.get(collection_name)
-            
-            # Fetch all objects (try different property names)
-            try:
-                response = collection.query.fetch_objects(
-                    limit=limit,
-                    return_properties=["title", "content"]  # Start with basic properties
-                )
-            except Exception as e:
-                print(f"❌ Error fetching with specific properties: {e}")
-                # Try with all properties
-                response = collection.query.fetch_objects(
-                    limit=limit,
-                    return_properties=["*"]  # Get all available properties
-                )
-            
-            if not response.objects:
-                print("❌ No content found in the collection")
-                return
-            
-            print(f"📊 Found {len(response.objects)} chunks")
-            print(f"📁 Total stored chunks: {len(response.objects)}")
-            
-            # Sort by chunk_id for proper order
-            sorted_objects = sorted(response.objects, key=lambda x: x.properties.get("chunk_id", 0))
+        # Only download the listing fields this collection has; content is
+        # fetched per chunk when the user asks for it
+        property_names = _property_names(collection)
+        list_properties = [name for name in LIST_PROPERTIES if name in property_names]
+        content_property = next((name for name in CONTENT_PROPERTIES if name in property_names), None)
+        
+        # Fetch one page at a time, in chunk order, and only when the user asks
+        # for more; the next page is never requested ahead of time
+        sort = Sort.by_property("chunk_id") if "chunk_id" in property_names else None
+        listed_objects = []
+        
+        while len(listed_objects) < limit:
+            page_size = min(PAGE_SIZE, limit - len(listed_objects))
+            response = collection.query.fetch_objects(
+                limit=page_size,
+                offset=len(listed_objects),
+                sort=sort,
+                return_properties=list_properties,
+                include_vector=False
+            )
             
-            for i, obj in enumerate(sorted_objects, 1):
+            for obj in response.objects:
+                listed_objects.append(obj)
                 props = obj.properties
                 title = props.get("title", "N/A")
-                content = props.get("content", "")
                 chunk_id = props.get("chunk_id", "N/A")
                 source_file = props.get("source_file", "N/A")
                 word_count = props.get("word_count", 0)
                 chunk_length = props.get("chunk_length", 0)
                 
-                print(f"\n📄 CHUNK {i} (ID: {chunk_id})")
+                print(f"\n📄 CHUNK {len(listed_objects)} (ID: {chunk_id})")
                 print(f"   Title: {title}")
                 print(f"   Source: {source_file}")
                 print(f"   Stats: {word_count} words, {chunk_length} characters")
-                print(f"   Content:")
-                print(f"   {'-' * 60}")
-                print(f"   {content}")
-                print(f"   {'-' * 60}")
-                
-                if i >= 10:  # Show first 10 chunks by default
-                    show_more = input(f"\nShowing {i} of {len(sorted_objects)} chunks. Continue? (y/n): ").lower()
-                    if show_more != 'y':
-                        break
             
-            print(f"\n✅ Displayed {min(i, len(sorted_objects))} chunks from {collection_name}")
+            if len(response.objects) < page_size or len(listed_objects) >= limit:
+                break
             
-        finally:
-            client.close()
+            show_more = input(f"\nShowing {len(listed_objects)} chunks. Continue? (y/n): ").lower()
+            if show_more != 'y':
+                break
+        
+        if not listed_objects:
+            print("❌ No content found in the collection")
+            return
+        
+        print(f"\n✅ Listed {len(listed_objects)} chunks from {collection_name}")
+        
+        if content_property is None:
+            return
+        
+        while True:
+            choice = input(f"\nChunk number to show (1-{len(listed_objects)}, Enter to finish): ").strip()
+            if not choice.isdigit() or not 1 <= int(choice) <= len(listed_objects):
+                break
             
+            obj = collection.query.fetch_object_by_id(
+                listed_objects[int(choice) - 1].uuid,
+                return_properties=[content_property],
+                include_vector=False
+            )
+            content = obj.properties.get(content_property, "") if obj else ""
+            print(f"   Content:")
+            print(f"   {'-' * 60}")
+            print(f"   {content}")
+            print(f"   {'-' * 60}")
+        
     except Exception as e:
         print(f"❌ Error viewing content: {e}")
 
 
+@lru_cache(maxsize=None)
+def uses_query_embedding_model(collection_name) -> bool:
+    """
+    Whether the collection's vectors are comparable with embed_query's
+    
+    True if they are client-supplied (no vectorizer) or come from
+    text2vec-openai with EMBEDDING_MODEL at its full size; vectors from any
+    other model live in a different space.
+    """
+    vectorizer = get_client().collections.get(collection_name).config.get().vectorizer_config
+    if vectorizer is None:
+        return True
+    return (
+        vectorizer.vectorizer == Vectorizers.TEXT2VEC_OPENAI
+        and vectorizer.model.get("model") == EMBEDDING_MODEL
+        and vectorizer.model.get("dimensions") is None
+    )
+
+
 def search_pdf_content(query, collection_name="Pdf_for_mira", limit=5):
     """Search for specific content in the stored PDF"""
     
     try:
-        # Connect to Weaviate
-        weaviate_url = os.environ["WEAVIATE_URL"]
-        weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
-        openai_key = os.environ.get("OPENAI_APIKEY") or os.environ.get("OPEN_AI_API")
+        client = get_client()
         
-        headers = {"X-OpenAI-Api-Key": openai_key}
+        print(f"🔍 Searching for: '{query}' in {collection_name}")
+        print("=" * 80)
         
-        client = weaviate.connect_to_weaviate_cloud(
-            cluster_url=weaviate_url,
-            auth_credentials=Auth.api_key(weaviate_api_key),
-            headers=headers
-        )
+        collection = client.collections.get(collection_name)
+        search_kwargs = {
+            "limit": limit,
+            "return_properties": ["title", "content", "chunk_id", "source_file"],
+            "return_metadata": MetadataQuery(distance=True, score=True),
+            "include_vector": False
+        }
         
-        try:
-            print(f"🔍 Searching for: '{query}' in {collection_name}")
-            print("=" * 80)
-            
-            collection = client.collections.get(collection_name)
-            
-            response = collection.query.near_text(
-                query=query,
-                limit=limit,
-                return_properties=["title", "content", "chunk_id", "source_file"],
-                return_metadata=MetadataQuery(distance=True, score=True)
-            )
-            
-            if not response.objects:
-                print("❌ No matching content found")
-                return
-            
-            print(f"📊 Found {len(response.objects)} relevant chunks")
-            
-            for i, obj in enumerate(response.objects, 1):
-                props = obj.properties
-                title = props.get("title", "N/A")
-                content = props.get("content", "")
-                chunk_id = props.get("chunk_id", "N/A")
-                source_file = props.get("source_file", "N/A")
-                
-                score = obj.metadata.score if hasattr(obj.metadata, 'score') else 0
-                distance = obj.metadata.distance if hasattr(obj.metadata, 'distance') else 0
-                
-                print(f"\n🎯 RESULT {i} (Chunk ID: {chunk_id})")
-                print(f"   Title: {title}")
-                print(f"   Source: {source_file}")
-                print(f"   Score: {score:.3f}, Distance: {distance:.3f}")
-                print(f"   Content:")
-                print(f"   {'-' * 60}")
-                print(f"   {content}")
-                print(f"   {'-' * 60}")
+        if uses_query_embedding_model(collection_name):
+            vector = embed_query(query)
+            cache_key = (collection_name, limit)
+            objects = _search_cache.get(vector, key=cache_key)
+            if objects is None:
+                objects = collection.query.near_vector(near_vector=vector, **search_kwargs).objects
+                _search_cache.put(vector, objects, key=cache_key)
+        else:
+            # Let the collection's own vectorizer embed the query
+            objects = collection.query.near_text(query=query, **search_kwargs).objects
+        
+        if not objects:
+            print("❌ No matching content found")
+            return
+        
+        print(f"📊 Found {len(objects)} relevant chunks")
+        
+        for i, obj in enumerate(objects, 1):
+            props = obj.properties
+            title = props.get("title", "N/A")
+            content = props.get("content", "")
+            chunk_id = props.get("chunk_id", "N/A")
+            source_file = props.get("source_file", "N/A")
             
-        finally:
-            client.close()
+            score = obj.metadata.score if hasattr(obj.metadata, 'score') else 0
+            distance = obj.metadata.distance if hasattr(obj.metadata, 'distance') else 0
             
+            print(f"\n🎯 RESULT {i} (Chunk ID: {chunk_id})")
+            print(f"   Title: {title}")
+            print(f"   Source: {source_file}")
+            print(f"   Score: {score:.3f}, Distance: {distance:.3f}")
+            print(f"   Content:")
+            print(f"   {'-' * 60}")
+            print(f"   {content}")
+            print(f"   {'-' * 60}")
+        
     except Exception as e:
         print(f"❌ Error searching content: {e}")
 
@@ -155,61 +213,70 @@ def get_pdf_summary(collection_name="Pdf_for_mira"):
     """Get a summary of the PDF content stored in Weaviate"""
     
     try:
-        # Connect to Weaviate
-        weaviate_url = os.environ["WEAVIATE_URL"]
-        weaviate_api_key = os.environ["WEAVIATE_API_KEY"]
-        openai_key = os.environ.get("OPENAI_APIKEY") or os.environ.get("OPEN_AI_API")
+        client = get_client()
         
-        headers = {"X-OpenAI-Api-Key": openai_key}
+        print(f"📈 Summary of collection: {collection_name}")
+        print("=" * 60)
         
-        client = weaviate.connect_to_weaviate_cloud(
-            cluster_url=weaviate_url,
-            auth_credentials=Auth.api_key(weaviate_api_key),
-            headers=headers
-        )
+        collection = client.collections.get(collection_name)
+        
+        # Compute the stats server-side; only aggregate properties this collection has
+        property_names = _property_names(collection)
+        metrics = [
+            Metrics(name).integer(sum_=True)
+            for name in ("word_count", "chunk_length")
+            if name in property_names
+        ]
+        if "source_file" in property_names:
+            metrics.append(Metrics("source_file").text(
+                top_occurrences_value=True,
+                min_occurrences=MAX_SUMMARY_SOURCE_FILES + 1
+            ))
         
         try:
-            print(f"📈 Summary of collection: {collection_name}")
-            print("=" * 60)
-            
-            collection = client.collections.get(collection_name)
-            
-            # Get basic stats - use flexible property fetching
-            try:
-                response = collection.query.fetch_objects(
-                    limit=1000,  # Get all chunks for stats
-                    return_properties=["*"]  # Get all available properties
-                )
-            except Exception as e:
-                print(f"❌ Error fetching objects: {e}")
-                return
-            
-            if not response.objects:
-                print("❌ No content found")
-                return
-            
-            total_chunks = len(response.objects)
-            total_words = sum(obj.properties.get("word_count", 0) for obj in response.objects)
-            total_chars = sum(obj.properties.get("chunk_length", 0) for obj in response.objects)
-            
-            # Get unique files
-            files = set(obj.properties.get("source_file", "Unknown") for obj in response.objects)
-            
-            # Get upload date (should be same for all chunks)
-            upload_date = response.objects[0].properties.get("upload_date", "Unknown")
-            
-            print(f"📊 Collection Statistics:")
-            print(f"   • Total chunks: {total_chunks}")
-            print(f"   • Total words: {total_words:,}")
-            print(f"   • Total characters: {total_chars:,}")
-            print(f"   • Source files: {', '.join(files)}")
-            print(f"   • Upload date: {upload_date}")
-            print(f"   • Average words per chunk: {total_words // total_chunks if total_chunks > 0 else 0}")
-            print(f"   • Average chars per chunk: {total_chars // total_chunks if total_chunks > 0 else 0}")
-            
-        finally:
-            client.close()
-            
+            aggregate = collection.aggregate.over_all(
+                total_count=True,
+                return_metrics=metrics or None
+            )
+        except Exception as e:
+            print(f"❌ Error aggregating objects: {e}")
+            return
+        
+        total_chunks = aggregate.total_count or 0
+        if not total_chunks:
+            print("❌ No content found")
+            return
+        
+        def property_sum(name):
+            metric = aggregate.properties.get(name)
+            return metric.sum_ or 0 if metric is not None else 0
+        
+        total_words = property_sum("word_count")
+        total_chars = property_sum("chunk_length")
+        
+        # Get unique files
+        source_metric = aggregate.properties.get("source_file")
+        files = [occurrence.value for occurrence in source_metric.top_occurrences] if source_metric else ["Unknown"]
+        # One extra file is fetched to tell a full list from a truncated one
+        if len(files) > MAX_SUMMARY_SOURCE_FILES:
+            files = files[:MAX_SUMMARY_SOURCE_FILES] + ["..."]
+        
+        # Get upload date (should be same for all chunks)
+        upload_date = "Unknown"
+        if "upload_date" in property_names:
+            response = collection.query.fetch_objects(limit=1, return_properties=["upload_date"])
+            if response.objects:
+                upload_date = response.objects[0].properties.get("upload_date", "Unknown")
+        
+        print(f"📊 Collection Statistics:")
+        print(f"   • Total chunks: {total_chunks}")
+        print(f"   • Total words: {total_words:,}")
+        print(f"   • Total characters: {total_chars:,}")
+        print(f"   • Source files: {', '.join(files)}")
+        print(f"   • Upload date: {upload_date}")
+        print(f"   • Average words per chunk: {total_words // total_chunks if total_chunks > 0 else 0}")
+        print(f"   • Average chars per chunk: {total_chars // total_chunks if total_chunks > 0 else 0}")
+        
     except Exception as e:
         print(f"❌ Error getting summary: {e}")
 
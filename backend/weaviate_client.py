@@ -1,16 +1,51 @@
 """
 Weaviate client connection and management functions
 """
+import asyncio
+import atexit
 import weaviate
 from weaviate.classes.init import Auth
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
+import time
 from contextlib import contextmanager
 
-from config import config
+from config import get_additional_config, get_config
 
 logger = logging.getLogger(__name__)
 
+HEALTH_CHECK_TTL = 5  # seconds a health check result is reused
+
+# Config setting -> header carrying that inference API key
+_HEADER_KEYS = (
+    ("openai_api_key", "X-OpenAI-Api-Key"),
+    ("cohere_api_key", "X-Cohere-Api-Key"),
+    ("huggingface_api_key", "X-HuggingFace-Api-Key"),
+)
+
+
+def _connection_settings(cluster_url: Optional[str] = None,
+                         api_key: Optional[str] = None,
+                         headers: Optional[Dict[str, str]] = None) -> Tuple[str, str, Dict[str, str]]:
+    """Resolve cluster URL, API key and inference API key headers from arguments and config"""
+    # Use provided values or fallback to config
+    config = get_config()
+    url = cluster_url or config.weaviate_url
+    key = api_key or config.weaviate_api_key
+    
+    # Prepare headers with inference API keys
+    default_headers = {
+        header: value
+        for setting, header in _HEADER_KEYS
+        if (value := getattr(config, setting, None))
+    }
+    
+    # Merge with provided headers
+    if headers:
+        default_headers.update(headers)
+    
+    return url, key, default_headers
+
 
 class WeaviateClient:
     """Weaviate client wrapper for cloud connections"""
@@ -18,6 +53,7 @@ class WeaviateClient:
     def __init__(self):
         self.client: Optional[weaviate.Client] = None
         self._is_connected = False
+        self._health_cache: Optional[Tuple[float, bool]] = None  # (checked at, healthy)
     
     def connect_to_cloud(self, 
                         cluster_url: Optional[str] = None,
@@ -35,27 +71,13 @@ class WeaviateClient:
             Connected Weaviate client
         """
         try:
-            # Use provided values or fallback to config
-            url = cluster_url or config.weaviate_url
-            key = api_key or config.weaviate_api_key
-            
-            # Prepare headers with inference API keys
-            default_headers = {}
-            if config.openai_api_key:
-                default_headers["X-OpenAI-Api-Key"] = config.openai_api_key
-            if config.cohere_api_key:
-                default_headers["X-Cohere-Api-Key"] = config.cohere_api_key
-            if config.huggingface_api_key:
-                default_headers["X-HuggingFace-Api-Key"] = config.huggingface_api_key
-            
-            # Merge with provided headers
-            if headers:
-                default_headers.update(headers)
+            url, key, default_headers = _connection_settings(cluster_url, api_key, headers)
             
             self.client = weaviate.connect_to_weaviate_cloud(
                 cluster_url=url,
                 auth_credentials=Auth.api_key(key),
-                headers=default_headers if default_headers else None
+                headers=default_headers if default_headers else None,
+                additional_config=get_additional_config()
             )
             
             self._is_connected = True
@@ -72,6 +94,7 @@ class WeaviateClient:
             try:
                 self.client.close()
                 self._is_connected = False
+                self._health_cache = None
                 logger.info("Disconnected from Weaviate")
             except Exception as e:
                 logger.error(f"Error disconnecting from Weaviate: {str(e)}")
@@ -86,21 +109,29 @@ class WeaviateClient:
             raise ConnectionError("Not connected to Weaviate. Call connect_to_cloud() first.")
         return self.client
     
-    def health_check(self) -> bool:
-        """Check if Weaviate instance is healthy"""
+    def health_check(self, ttl: float = HEALTH_CHECK_TTL) -> bool:
+        """Check if Weaviate instance is healthy; reuses a result younger than ttl seconds"""
+        if not self.is_connected():
+            return False
+        if self._health_cache is not None:
+            checked_at, healthy = self._health_cache
+            if time.monotonic() - checked_at < ttl:
+                return healthy
+        
         try:
-            if not self.is_connected():
-                return False
             # Try to list collections as a health check
             self.client.collections.list_all()
-            return True
+            healthy = True
         except Exception as e:
             logger.error(f"Health check failed: {str(e)}")
-            return False
+            healthy = False
+        self._health_cache = (time.monotonic(), healthy)
+        return healthy
 
 
-# Global client instance
+# Global client instance, closed at interpreter exit
 weaviate_client = WeaviateClient()
+atexit.register(weaviate_client.disconnect)
 
 
 # Convenience functions
@@ -128,6 +159,57 @@ def connect_to_weaviate_cloud(cluster_url: Optional[str] = None,
     return weaviate_client.connect_to_cloud(cluster_url, api_key, headers)
 
 
+def get_async_weaviate_client(cluster_url: Optional[str] = None,
+                              api_key: Optional[str] = None,
+                              headers: Optional[Dict[str, str]] = None) -> weaviate.WeaviateAsyncClient:
+    """
+    Create an async Weaviate Cloud client
+    
+    The client is not connected yet; use it as an async context manager:
+    
+        async with get_async_weaviate_client() as client:
+            collection = client.collections.get("MyCollection")
+    """
+    url, key, default_headers = _connection_settings(cluster_url, api_key, headers)
+    return weaviate.use_async_with_weaviate_cloud(
+        cluster_url=url,
+        auth_credentials=Auth.api_key(key),
+        headers=default_headers if default_headers else None,
+        additional_config=get_additional_config()
+    )
+
+
+# Shared async client as (event loop, connect task); see get_shared_async_weaviate_client()
+_async_client: Optional[Tuple[asyncio.AbstractEventLoop, "asyncio.Task[weaviate.WeaviateAsyncClient]"]] = None
+
+
+async def _connect_async(client: weaviate.WeaviateAsyncClient) -> weaviate.WeaviateAsyncClient:
+    await client.connect()
+    return client
+
+
+async def get_shared_async_weaviate_client() -> weaviate.WeaviateAsyncClient:
+    """
+    Get the shared async client, connecting it on first use
+    
+    Async connections belong to the event loop that opened them, so the
+    client is reused by every caller on the same loop and a new one is
+    connected when called from a different loop. Don't close it yourself.
+    """
+    global _async_client
+    loop = asyncio.get_running_loop()
+    entry = _async_client
+    if entry is None or entry[0] is not loop:
+        entry = _async_client = (loop, loop.create_task(_connect_async(get_async_weaviate_client())))
+    try:
+        # Shielded so a cancelled caller doesn't cancel the connect for everyone else
+        return await asyncio.shield(entry[1])
+    except Exception:
+        if _async_client is entry:
+            _async_client = None
+        raise
+
+
 @contextmanager
 def weaviate_connection(cluster_url: Optional[str] = None,
                        api_key: Optional[str] = None,
@@ -135,17 +217,18 @@ def weaviate_connection(cluster_url: Optional[str] = None,
     """
     Context manager for Weaviate connections
     
+    Yields the shared global client, connecting it on first use; the
+    connection stays open across blocks and is closed at interpreter exit.
+    The arguments only apply when this call makes the connection.
+    
     Usage:
         with weaviate_connection() as client:
             # Use client here
             collections = client.collections.list_all()
     """
-    temp_client = WeaviateClient()
-    try:
-        client = temp_client.connect_to_cloud(cluster_url, api_key, headers)
-        yield client
-    finally:
-        temp_client.disconnect()
+    if not weaviate_client.is_connected():
+        weaviate_client.connect_to_cloud(cluster_url, api_key, headers)
+    yield weaviate_client.get_client()
 
 
 def disconnect_weaviate():
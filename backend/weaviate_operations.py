@@ -1,23 +1,156 @@
 """
 Common Weaviate operations and utilities
 """
+import asyncio
+import functools
+import inspect
+from itertools import chain, islice
+from uuid import uuid4
+import grpc
 import weaviate
 from weaviate.classes.config import Configure, Property, DataType
 from weaviate.classes.query import Filter, MetadataQuery, HybridFusion
 from weaviate.classes.data import DataObject
-from typing import List, Dict, Any, Optional, Union
+from weaviate.exceptions import UnexpectedStatusCodeError, WeaviateQueryError
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence, Sized, Tuple, Union
 import logging
+import time
 
-from weaviate_client import get_weaviate_client
+from embeddings import iter_embeddings
+from weaviate_client import get_shared_async_weaviate_client, get_weaviate_client
 
 logger = logging.getLogger(__name__)
 
+# Retries for requests that fail with a transient gRPC status
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.1  # seconds, doubled per retry
+_TRANSIENT_STATUS_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+})
+
+# Search request settings, shared by every query; the client only reads them
+_META_SCORE = MetadataQuery(score=True)
+_META_DIST_SCORE = MetadataQuery(distance=True, score=True)
+_HYBRID_FUSION = HybridFusion.RELATIVE_SCORE
+
+LIST_COLLECTIONS_TTL = 5  # seconds a list_collections result is reused
+
+# batch_insert sends up to this many objects as one insert_many request;
+# larger inputs are streamed through a fixed-size batch. The request is a
+# single gRPC message, so this keeps ~8KB objects (a 1536-dim float vector
+# plus a text chunk) well under the default 10MB message limit
+INSERT_MANY_MAX_OBJECTS = 500
+# Objects batch_insert checks for existence and embeds together
+INSERT_WINDOW_SIZE = 1000
+
+# create_collection lookups, built once at import
+_DTYPE_MAP = {dtype.name: dtype for dtype in DataType}
+# Vectorizer module name -> Configure.Vectorizer factory
+_VECTORIZERS = {
+    "text2vec-openai": Configure.Vectorizer.text2vec_openai,
+    "text2vec-cohere": Configure.Vectorizer.text2vec_cohere,
+}
+# Generative model name prefix -> Configure.Generative factory
+_GENERATIVES = {
+    "gpt": Configure.Generative.openai,
+    "command": Configure.Generative.cohere,
+}
+
+
+def _log_errors(message: str, fallback: Optional[Callable[[], Any]] = None):
+    """
+    Log exceptions raised by a method and return a fallback value instead
+    
+    The try/except is paid on every call; hot loops and callers that handle
+    errors themselves use the method's undecorated _<name>_raw alias.
+    
+    Args:
+        message: Log message prefix, formatted with the method's arguments
+        fallback: Called to build the return value on error (None if not given)
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                bound = signature.bind_partial(*args, **kwargs)
+                logger.error(f"{message.format(**bound.arguments)}: {str(e)}")
+                return fallback() if fallback else None
+        return wrapper
+    return decorator
+
+
+def _is_transient(error: WeaviateQueryError) -> bool:
+    """Whether a failed request is worth retrying"""
+    if isinstance(error.__cause__, grpc.RpcError):
+        return error.__cause__.code() in _TRANSIENT_STATUS_CODES
+    # Search errors only carry the gRPC status in their message; UNAVAILABLE
+    # isn't retried there because the client has already retried it
+    return any(
+        f"StatusCode.{code.name}" in str(error)
+        for code in _TRANSIENT_STATUS_CODES - {grpc.StatusCode.UNAVAILABLE}
+    )
+
+
+def _retry(func: Callable[..., Any], *args, retries: int = RETRY_ATTEMPTS, base_delay: float = RETRY_BASE_DELAY, **kwargs) -> Any:
+    """
+    Call func, retrying with exponential backoff when it fails transiently
+    
+    Args:
+        func: Client call to make
+        *args, **kwargs: Arguments for func
+        retries: Retries after the first attempt
+        base_delay: Seconds slept before the first retry; doubled for each further one
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except WeaviateQueryError as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            delay = base_delay * 2 ** attempt
+            logger.warning("Transient Weaviate error, retrying in %.2fs: %s", delay, e)
+            time.sleep(delay)
+
+
+def _keep_uuid(value):
+    """Search result UUID passed through unconverted"""
+    return value
+
+
+def _generative_result(response) -> Dict[str, Any]:
+    """Shape a generate.* response into the generated text plus its source objects"""
+    return {
+        "generated_text": getattr(response, 'generated', None),
+        "sources": [
+            {
+                "uuid": str(obj.uuid),
+                "properties": obj.properties,
+                "generated": getattr(obj, 'generated', None)
+            }
+            for obj in response.objects
+        ]
+    }
+
+
+def _no_generation() -> Dict[str, Any]:
+    """Generative search result returned on failure"""
+    return {"generated_text": None, "sources": []}
+
 
 class WeaviateOperations:
     """High-level operations for Weaviate"""
     
     def __init__(self):
         self.client = None
+        self._collections: Dict[str, Any] = {}
+        self._collection_names_cache: Optional[Tuple[float, List[str]]] = None  # (listed at, names)
+        self._known_collections: set = set()  # created or ensured by this instance
     
     def _get_client(self) -> weaviate.Client:
         """Get or initialize Weaviate client"""
@@ -25,12 +158,23 @@ class WeaviateOperations:
             self.client = get_weaviate_client()
         return self.client
     
+    def _collection(self, name: str) -> Any:
+        """Get a collection handle, resolved once per name and reused"""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = self._get_client().collections.get(name)
+        return collection
+    
     # Collection Management
     def create_collection(self, 
                          name: str,
                          properties: List[Dict[str, Any]],
                          vectorizer: str = "text2vec-openai",
-                         generative_model: str = "gpt-3.5-turbo") -> bool:
+                         generative_model: str = "gpt-3.5-turbo",
+                         vectorizer_model: Optional[str] = None,
+                         vectorize_collection_name: bool = True,
+                         vector_dimensions: Optional[int] = None,
+                         exist_ok: bool = False) -> bool:
         """
         Create a new collection with properties
         
@@ -39,6 +183,14 @@ class WeaviateOperations:
             properties: List of property definitions [{"name": str, "type": str}]
             vectorizer: Vectorizer to use
             generative_model: Generative model for RAG
+            vectorizer_model: Embedding model for the vectorizer (provider default if None);
+                must match the model of any vectors supplied client-side
+            vectorize_collection_name: Prefix the collection name to the text the
+                vectorizer embeds; disable so server-side vectors match client-side
+                embeddings of the same text
+            vector_dimensions: Embedding size for models that support shortening
+                (e.g. text-embedding-3-*); model default if None
+            exist_ok: Treat an existing collection with this name as success
             
         Returns:
             Success status
@@ -47,65 +199,134 @@ class WeaviateOperations:
             client = self._get_client()
             
             # Convert property definitions
-            weaviate_properties = []
-            for prop in properties:
-                data_type = getattr(DataType, prop["type"].upper(), DataType.TEXT)
-                weaviate_properties.append(
-                    Property(name=prop["name"], data_type=data_type)
-                )
+            weaviate_properties = [
+                Property(name=prop["name"], data_type=_DTYPE_MAP.get(prop["type"].upper(), DataType.TEXT))
+                for prop in properties
+            ]
             
             # Configure vectorizer
-            vector_config = None
-            if vectorizer == "text2vec-openai":
-                vector_config = Configure.Vectors.text2vec_openai()
-            elif vectorizer == "text2vec-cohere":
-                vector_config = Configure.Vectors.text2vec_cohere()
+            vectorizer_config = None
+            vectorizer_factory = _VECTORIZERS.get(vectorizer)
+            if vectorizer_factory:
+                model_kwargs = {"vectorize_collection_name": vectorize_collection_name}
+                if vectorizer_model:
+                    model_kwargs["model"] = vectorizer_model
+                if vector_dimensions:
+                    model_kwargs["dimensions"] = vector_dimensions
+                vectorizer_config = vectorizer_factory(**model_kwargs)
             
             # Configure generative model
             generative_config = None
-            if generative_model.startswith("gpt"):
-                generative_config = Configure.Generative.openai(model=generative_model)
-            elif generative_model.startswith("command"):
-                generative_config = Configure.Generative.cohere(model=generative_model)
+            generative_factory = next(
+                (factory for prefix, factory in _GENERATIVES.items() if generative_model.startswith(prefix)),
+                None
+            )
+            if generative_factory:
+                generative_config = generative_factory(model=generative_model)
             
             client.collections.create(
                 name=name,
                 properties=weaviate_properties,
-                vector_config=vector_config,
+                vectorizer_config=vectorizer_config,
                 generative_config=generative_config
             )
             
+            self._collection_names_cache = None
+            self._known_collections.add(name)
             logger.info(f"Created collection: {name}")
             return True
             
+        except UnexpectedStatusCodeError as e:
+            if exist_ok and "already exists" in str(e):
+                self._known_collections.add(name)
+                self._warn_vectorizer_mismatch(name, vectorizer_config)
+                return True
+            logger.error(f"Failed to create collection {name}: {str(e)}")
+            return False
         except Exception as e:
             logger.error(f"Failed to create collection {name}: {str(e)}")
             return False
     
-    def collection_exists(self, name: str) -> bool:
-        """Check if collection exists"""
+    def _warn_vectorizer_mismatch(self, name: str, requested: Any) -> None:
+        """Log requested vectorizer settings an existing collection doesn't have; they're fixed at creation"""
+        if requested is None:
+            return
         try:
-            client = self._get_client()
-            return client.collections.exists(name)
+            existing = self._collection(name).config.get().vectorizer_config
         except Exception as e:
-            logger.error(f"Error checking collection existence: {str(e)}")
-            return False
+            logger.warning(f"Could not read vectorizer config of {name}: {str(e)}")
+            return
+        
+        if existing is None or existing.vectorizer != requested.vectorizer:
+            # Vectorizers is a str enum; unknown modules come back as plain strings
+            existing_name = str(getattr(existing.vectorizer, "value", existing.vectorizer)) if existing else "none"
+            logger.warning("Collection %s uses vectorizer %s, not the requested %s",
+                           name, existing_name, requested.vectorizer.value)
+            return
+        stored = {**existing.model, "vectorizeClassName": existing.vectorize_collection_name}
+        mismatched = {
+            setting: (stored.get(setting), value)
+            for setting, value in requested._to_dict().items()
+            if setting in ("model", "dimensions", "vectorizeClassName") and stored.get(setting) != value
+        }
+        if mismatched:
+            logger.warning("Collection %s already exists with different vectorizer settings "
+                           "(existing, requested): %s", name, mismatched)
     
-    def list_collections(self) -> List[str]:
-        """List all collection names"""
+    def ensure_collection(self, name: str, properties: List[Dict[str, Any]], **kwargs) -> bool:
+        """
+        Create a collection unless it already exists
+        
+        Sends the create request directly rather than checking existence
+        first, and skips the request for collections this instance already
+        created or ensured.
+        
+        Args:
+            name: Collection name
+            properties: List of property definitions [{"name": str, "type": str}]
+            **kwargs: Further create_collection options, used only if it is created;
+                vectorizer settings an existing collection lacks are logged
+            
+        Returns:
+            Success status
+        """
+        if name in self._known_collections:
+            return True
+        return self.create_collection(name, properties, exist_ok=True, **kwargs)
+    
+    @_log_errors("Error checking collection existence", fallback=bool)
+    def collection_exists(self, name: str) -> bool:
+        """Check if collection exists"""
+        client = self._get_client()
+        return client.collections.exists(name)
+    
+    _collection_exists_raw = collection_exists.__wrapped__  # raises instead of logging
+    
+    def list_collections(self, ttl: float = LIST_COLLECTIONS_TTL) -> List[str]:
+        """List all collection names; reuses a listing younger than ttl seconds"""
+        if self._collection_names_cache is not None:
+            listed_at, names = self._collection_names_cache
+            if time.monotonic() - listed_at < ttl:
+                return list(names)
+        
         try:
             client = self._get_client()
-            collections = client.collections.list_all()
-            return [collection.name for collection in collections]
+            # list_all() maps collection names to their configs
+            names = list(client.collections.list_all())
         except Exception as e:
             logger.error(f"Error listing collections: {str(e)}")
             return []
+        self._collection_names_cache = (time.monotonic(), names)
+        return list(names)
     
     def delete_collection(self, name: str) -> bool:
         """Delete a collection"""
         try:
             client = self._get_client()
             client.collections.delete(name)
+            self._collections.pop(name, None)
+            self._known_collections.discard(name)
+            self._collection_names_cache = None
             logger.info(f"Deleted collection: {name}")
             return True
         except Exception as e:
@@ -113,109 +334,326 @@ class WeaviateOperations:
             return False
     
     # Data Operations
+    @_log_errors("Failed to insert object into {collection_name}")
     def insert_object(self, 
                      collection_name: str,
                      properties: Dict[str, Any],
-                     vector: Optional[List[float]] = None,
+                     vector: Optional[Sequence[float]] = None,
                      uuid: Optional[str] = None) -> Optional[str]:
         """
         Insert a single object into collection
         
+        Each call is a separate request; use batch_insert when storing
+        more than a handful of objects.
+        
         Args:
             collection_name: Target collection
             properties: Object properties
-            vector: Optional custom vector
+            vector: Optional custom vector (list or numpy array)
             uuid: Optional specific UUID
             
         Returns:
             Object UUID if successful
         """
-        try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            kwargs = {"properties": properties}
-            if vector:
-                kwargs["vector"] = vector
-            if uuid:
-                kwargs["uuid"] = uuid
-            
-            object_uuid = collection.data.insert(**kwargs)
-            logger.info(f"Inserted object into {collection_name}: {object_uuid}")
-            return str(object_uuid)
-            
-        except Exception as e:
-            logger.error(f"Failed to insert object into {collection_name}: {str(e)}")
-            return None
+        collection = self._collection(collection_name)
+        
+        kwargs = {"properties": properties}
+        if vector is not None:
+            kwargs["vector"] = vector
+        if uuid:
+            kwargs["uuid"] = uuid
+        
+        object_uuid = collection.data.insert(**kwargs)
+        logger.debug("Inserted object into %s: %s", collection_name, object_uuid)
+        return str(object_uuid)
+    
+    _insert_object_raw = insert_object.__wrapped__  # raises instead of logging
     
     def batch_insert(self,
                     collection_name: str,
-                    objects: List[Dict[str, Any]],
-                    batch_size: int = 100) -> Dict[str, Any]:
+                    objects: Iterable[Dict[str, Any]],
+                    batch_size: int = 200,
+                    concurrent_requests: int = 4,
+                    skip_existing: bool = False,
+                    embed_property: Optional[str] = None) -> Dict[str, Any]:
         """
         Batch insert objects
         
+        Objects are consumed lazily, INSERT_WINDOW_SIZE at a time, so a
+        generator can feed any number of them in bounded memory. Up to
+        INSERT_MANY_MAX_OBJECTS objects are sent in one insert_many request;
+        more go through a fixed-size batch.
+        
         Args:
             collection_name: Target collection
-            objects: List of objects with 'properties' and optional 'vector'
-            batch_size: Batch size for insertion
+            objects: Objects with 'properties' and optional 'vector' and 'uuid';
+                vectors may be lists or numpy arrays (the client turns arrays
+                into lists before packing them, so don't convert lists)
+            batch_size: Objects per batch request; each request is one gRPC message,
+                so batch_size times the object size must stay under the server's
+                gRPC message limit (negotiated at connect, 10MB by default)
+            concurrent_requests: Batch requests sent in parallel
+            skip_existing: Don't send objects whose 'uuid' is already stored, so
+                content-addressed objects aren't re-vectorized
+            embed_property: Embed this property client-side in bulk OpenAI requests
+                (see embeddings.EMBEDDING_MODEL) instead of having Weaviate
+                vectorize each object; any 'vector' on the objects is ignored
             
         Returns:
             Results summary
         """
+        total_count = 0
+        skipped_count = 0
+        
+        def items(source):
+            nonlocal total_count, skipped_count
+            source = iter(source)
+            for window in iter(lambda: list(islice(source, INSERT_WINDOW_SIZE)), []):
+                total_count += len(window)
+                if skip_existing:
+                    existing = self.existing_ids(collection_name, [obj["uuid"] for obj in window if obj.get("uuid")])
+                    to_insert = [obj for obj in window if str(obj.get("uuid")) not in existing]
+                    skipped_count += len(window) - len(to_insert)
+                else:
+                    to_insert = window
+                
+                if embed_property:
+                    vectors = iter_embeddings([obj["properties"][embed_property] for obj in to_insert])
+                else:
+                    vectors = (obj.get("vector") for obj in to_insert)
+                
+                for obj, vector in zip(to_insert, vectors):
+                    yield {"properties": obj["properties"], "vector": vector, "uuid": obj.get("uuid")}
+        
         try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            inserted_count = 0
-            failed_count = 0
-            
-            with collection.batch.fixed_size(batch_size=batch_size) as batch:
-                for obj in objects:
-                    batch.add_object(
-                        properties=obj["properties"],
-                        vector=obj.get("vector")
-                    )
-            
-            # Check for failed objects after batch completes
-            failed_objects = collection.batch.failed_objects
-            failed_count = len(failed_objects) if failed_objects else 0
-            inserted_count = len(objects) - failed_count
+            collection = self._collection(collection_name)
+            
+            objects = iter(objects)
+            head = list(islice(objects, INSERT_MANY_MAX_OBJECTS + 1))
+            if len(head) <= INSERT_MANY_MAX_OBJECTS:
+                sent_count, failed_count = self._insert_many(collection, items(head))
+            else:
+                sent_count, failed_count = self._add_to_batch(
+                    collection, items(chain(head, objects)), batch_size, concurrent_requests
+                )
+            inserted_count = sent_count - failed_count
             
-            logger.info(f"Batch insert to {collection_name}: {inserted_count} success, {failed_count} failed")
+            logger.info("Batch insert to %s: %d success, %d failed, %d skipped",
+                        collection_name, inserted_count, failed_count, skipped_count)
             return {
                 "inserted": inserted_count,
                 "failed": failed_count,
-                "total": len(objects)
+                "skipped": skipped_count,
+                "total": total_count
             }
             
         except Exception as e:
             logger.error(f"Batch insert failed for {collection_name}: {str(e)}")
-            return {"inserted": 0, "failed": len(objects), "total": len(objects)}
+            return {"inserted": 0, "failed": total_count, "skipped": 0, "total": total_count}
     
-    def get_object_by_id(self, collection_name: str, object_id: str, include_vector: bool = False) -> Optional[Dict[str, Any]]:
-        """Get object by UUID"""
+    async def abatch_insert(self,
+                            collection_name: str,
+                            objects: Iterable[Dict[str, Any]],
+                            batch_size: int = 100,
+                            concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Batch insert objects with several insert requests in flight at once
+        
+        Objects are split into sub-batches of batch_size, each sent as one
+        insert_many request on the shared async client; at most concurrency
+        requests (and sub-batches) are in flight at the same time.
+        
+        Args:
+            collection_name: Target collection
+            objects: Objects with 'properties' and optional 'vector' and 'uuid'
+            batch_size: Objects per insert request
+            concurrency: Maximum insert requests in flight
+            
+        Returns:
+            Results summary
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+        total_count = 0  # objects pulled from the input so far
+        inserted_count = 0
+        
+        def counted(source):
+            nonlocal total_count
+            for obj in source:
+                total_count += 1
+                yield obj
+        
+        async def send(collection, chunk):
+            nonlocal inserted_count
+            try:
+                data_objects = [
+                    DataObject(properties=obj["properties"], vector=obj.get("vector"), uuid=obj.get("uuid"))
+                    for obj in chunk
+                ]
+                result = await collection.data.insert_many(data_objects)
+                inserted_count += len(chunk) - len(result.errors)
+            except Exception as e:
+                logger.error(f"Insert request to {collection_name} failed: {str(e)}")
+            finally:
+                semaphore.release()
+        
         try:
-            client = self._get_client()
+            client = await get_shared_async_weaviate_client()
             collection = client.collections.get(collection_name)
-            obj = collection.query.fetch_object_by_id(object_id, include_vector=include_vector)
-            
-            result = {"properties": obj.properties}
-            if include_vector and hasattr(obj, 'vector'):
-                result["vector"] = obj.vector
             
-            return result
+            # Only pull the next sub-batch once a request slot is free, so at
+            # most concurrency sub-batches are held in memory at a time
+            iterator = counted(objects)
+            while True:
+                await semaphore.acquire()
+                chunk = list(islice(iterator, batch_size))
+                if not chunk:
+                    semaphore.release()
+                    break
+                task = asyncio.ensure_future(send(collection, chunk))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+            
+            logger.info("Async batch insert to %s: %d success, %d failed",
+                        collection_name, inserted_count, total_count - inserted_count)
             
         except Exception as e:
-            logger.error(f"Failed to get object {object_id} from {collection_name}: {str(e)}")
-            return None
+            logger.error(f"Async batch insert failed for {collection_name}: {str(e)}")
+            # Requests already sent still count; every other object failed
+            await asyncio.gather(*tasks)
+            if isinstance(objects, Sized):
+                total_count = len(objects)
+        
+        return {
+            "inserted": inserted_count,
+            "failed": total_count - inserted_count,
+            "total": total_count
+        }
+    
+    @staticmethod
+    def _add_to_batch(collection: Any,
+                      objects: Iterable[Dict[str, Any]],
+                      batch_size: int,
+                      concurrent_requests: int) -> Tuple[int, int]:
+        """Send objects through one fixed-size batch; returns (sent, failed) counts"""
+        total_count = 0
+        with collection.batch.fixed_size(
+            batch_size=batch_size,
+            concurrent_requests=concurrent_requests
+        ) as batch:
+            for obj in objects:
+                batch.add_object(
+                    properties=obj["properties"],
+                    vector=obj.get("vector"),
+                    uuid=obj.get("uuid")
+                )
+                total_count += 1
+        
+        # Check for failed objects after batch completes
+        failed_objects = collection.batch.failed_objects
+        return total_count, len(failed_objects) if failed_objects else 0
+    
+    @staticmethod
+    def _insert_many(collection: Any, objects: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """Send objects in a single insert_many request; returns (sent, failed) counts"""
+        # Fix each object's UUID up front so a retried request can't store duplicates
+        data_objects = [
+            DataObject(properties=obj["properties"], vector=obj.get("vector"), uuid=obj.get("uuid") or uuid4())
+            for obj in objects
+        ]
+        if not data_objects:
+            return 0, 0
+        response = _retry(collection.data.insert_many, data_objects)
+        return len(data_objects), len(response.errors) if response.has_errors else 0
+    
+    def existing_ids(self, collection_name: str, object_ids: List[str], batch_size: int = 1000) -> set:
+        """
+        Find which of the given object IDs are already stored
+        
+        Args:
+            collection_name: Collection to check
+            object_ids: Candidate object IDs
+            batch_size: IDs checked per query
+            
+        Returns:
+            Set of IDs (as strings) that already exist
+        """
+        collection = self._collection(collection_name)
+        
+        existing = set()
+        for start in range(0, len(object_ids), batch_size):
+            batch_ids = object_ids[start:start + batch_size]
+            response = collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(batch_ids),
+                limit=len(batch_ids),
+                return_properties=[]
+            )
+            existing.update(str(obj.uuid) for obj in response.objects)
+        return existing
+    
+    @_log_errors("Failed to get object {object_id} from {collection_name}")
+    def get_object_by_id(self, collection_name: str, object_id: str, include_vector: bool = False) -> Optional[Dict[str, Any]]:
+        """Get object by UUID; use get_objects_by_ids to fetch several"""
+        collection = self._collection(collection_name)
+        obj = collection.query.fetch_object_by_id(object_id, include_vector=include_vector)
+        
+        result = {"properties": obj.properties}
+        if include_vector and hasattr(obj, 'vector'):
+            result["vector"] = obj.vector
+        
+        return result
+    
+    _get_object_by_id_raw = get_object_by_id.__wrapped__  # raises instead of logging
+    
+    @_log_errors("Failed to get objects from {collection_name}", fallback=dict)
+    def get_objects_by_ids(self,
+                           collection_name: str,
+                           object_ids: List[str],
+                           include_vector: bool = False,
+                           batch_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many objects by UUID in one query per batch_size IDs
+        
+        Use instead of calling get_object_by_id in a loop.
+        
+        Args:
+            collection_name: Collection to read from
+            object_ids: UUIDs to fetch
+            include_vector: Also return each object's vector
+            batch_size: IDs fetched per query
+            
+        Returns:
+            Found objects keyed by UUID string; missing IDs are left out
+        """
+        collection = self._collection(collection_name)
+        
+        objects = {}
+        for start in range(0, len(object_ids), batch_size):
+            batch_ids = object_ids[start:start + batch_size]
+            response = collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(batch_ids),
+                limit=len(batch_ids),
+                include_vector=include_vector
+            )
+            for obj in response.objects:
+                result = {"properties": obj.properties}
+                if include_vector:
+                    result["vector"] = obj.vector
+                objects[str(obj.uuid)] = result
+        return objects
+    
+    _get_objects_by_ids_raw = get_objects_by_ids.__wrapped__  # raises instead of logging
     
     # Search Operations
+    @_log_errors("Semantic search failed for {collection_name}", fallback=list)
     def semantic_search(self,
                        collection_name: str,
                        query: str,
                        limit: int = 10,
-                       properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                       properties: Optional[List[str]] = None,
+                       include_metadata: bool = True,
+                       as_str_uuid: bool = True) -> List[Dict[str, Any]]:
         """
         Perform semantic search using near_text
         
@@ -224,44 +662,46 @@ class WeaviateOperations:
             query: Search query
             limit: Number of results
             properties: Properties to return
+            include_metadata: Request and return result metadata (distance/score)
+            as_str_uuid: Return UUIDs as strings; False keeps the UUID objects, e.g.
+                for follow-up Filter.by_id() queries
             
         Returns:
             List of search results
         """
-        try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            response = collection.query.near_text(
-                query=query,
-                limit=limit,
-                return_properties=properties,
-                return_metadata=MetadataQuery(distance=True, score=True)
-            )
-            
-            results = []
-            for obj in response.objects:
-                result = {
-                    "uuid": str(obj.uuid),
-                    "properties": obj.properties,
-                    "metadata": {
-                        "distance": obj.metadata.distance,
-                        "score": obj.metadata.score
-                    }
-                }
-                results.append(result)
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Semantic search failed for {collection_name}: {str(e)}")
-            return []
+        collection = self._collection(collection_name)
+        
+        response = _retry(
+            collection.query.near_text,
+            query=query,
+            limit=limit,
+            return_properties=properties,
+            return_metadata=_META_DIST_SCORE if include_metadata else None
+        )
+        
+        uuid_of = str if as_str_uuid else _keep_uuid
+        if not include_metadata:
+            return [{"uuid": uuid_of(obj.uuid), "properties": obj.properties} for obj in response.objects]
+        
+        return [
+            {
+                "uuid": uuid_of(obj.uuid),
+                "properties": obj.properties,
+                "metadata": {"distance": obj.metadata.distance, "score": obj.metadata.score}
+            }
+            for obj in response.objects
+        ]
+    
+    _semantic_search_raw = semantic_search.__wrapped__  # raises instead of logging
     
+    @_log_errors("Keyword search failed for {collection_name}", fallback=list)
     def keyword_search(self,
                       collection_name: str,
                       query: str,
                       limit: int = 10,
-                      properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                      properties: Optional[List[str]] = None,
+                      include_metadata: bool = True,
+                      as_str_uuid: bool = True) -> List[Dict[str, Any]]:
         """
         Perform keyword search using BM25
         
@@ -270,45 +710,48 @@ class WeaviateOperations:
             query: Search query
             limit: Number of results
             properties: Properties to search in and return
+            include_metadata: Request and return result metadata (score)
+            as_str_uuid: Return UUIDs as strings; False keeps the UUID objects, e.g.
+                for follow-up Filter.by_id() queries
             
         Returns:
             List of search results
         """
-        try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            response = collection.query.bm25(
-                query=query,
-                query_properties=properties,
-                limit=limit,
-                return_properties=properties,
-                return_metadata=MetadataQuery(score=True)
-            )
-            
-            results = []
-            for obj in response.objects:
-                result = {
-                    "uuid": str(obj.uuid),
-                    "properties": obj.properties,
-                    "metadata": {
-                        "score": obj.metadata.score
-                    }
-                }
-                results.append(result)
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Keyword search failed for {collection_name}: {str(e)}")
-            return []
+        collection = self._collection(collection_name)
+        
+        response = _retry(
+            collection.query.bm25,
+            query=query,
+            query_properties=properties,
+            limit=limit,
+            return_properties=properties,
+            return_metadata=_META_SCORE if include_metadata else None
+        )
+        
+        uuid_of = str if as_str_uuid else _keep_uuid
+        if not include_metadata:
+            return [{"uuid": uuid_of(obj.uuid), "properties": obj.properties} for obj in response.objects]
+        
+        return [
+            {
+                "uuid": uuid_of(obj.uuid),
+                "properties": obj.properties,
+                "metadata": {"score": obj.metadata.score}
+            }
+            for obj in response.objects
+        ]
     
+    _keyword_search_raw = keyword_search.__wrapped__  # raises instead of logging
+    
+    @_log_errors("Hybrid search failed for {collection_name}", fallback=list)
     def hybrid_search(self,
                      collection_name: str,
                      query: str,
                      alpha: float = 0.5,
                      limit: int = 10,
-                     properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                     properties: Optional[List[str]] = None,
+                     include_metadata: bool = True,
+                     as_str_uuid: bool = True) -> List[Dict[str, Any]]:
         """
         Perform hybrid search (semantic + keyword)
         
@@ -318,41 +761,42 @@ class WeaviateOperations:
             alpha: Balance between semantic (0.0) and keyword (1.0)
             limit: Number of results
             properties: Properties to return
+            include_metadata: Request and return result metadata (score)
+            as_str_uuid: Return UUIDs as strings; False keeps the UUID objects, e.g.
+                for follow-up Filter.by_id() queries
             
         Returns:
             List of search results
         """
-        try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            response = collection.query.hybrid(
-                query=query,
-                alpha=alpha,
-                fusion_type=HybridFusion.RELATIVE_SCORE,
-                limit=limit,
-                return_properties=properties,
-                return_metadata=MetadataQuery(score=True)
-            )
-            
-            results = []
-            for obj in response.objects:
-                result = {
-                    "uuid": str(obj.uuid),
-                    "properties": obj.properties,
-                    "metadata": {
-                        "score": obj.metadata.score
-                    }
-                }
-                results.append(result)
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Hybrid search failed for {collection_name}: {str(e)}")
-            return []
+        collection = self._collection(collection_name)
+        
+        response = _retry(
+            collection.query.hybrid,
+            query=query,
+            alpha=alpha,
+            fusion_type=_HYBRID_FUSION,
+            limit=limit,
+            return_properties=properties,
+            return_metadata=_META_SCORE if include_metadata else None
+        )
+        
+        uuid_of = str if as_str_uuid else _keep_uuid
+        if not include_metadata:
+            return [{"uuid": uuid_of(obj.uuid), "properties": obj.properties} for obj in response.objects]
+        
+        return [
+            {
+                "uuid": uuid_of(obj.uuid),
+                "properties": obj.properties,
+                "metadata": {"score": obj.metadata.score}
+            }
+            for obj in response.objects
+        ]
+    
+    _hybrid_search_raw = hybrid_search.__wrapped__  # raises instead of logging
     
     # Generative Search (RAG)
+    @_log_errors("Generative search failed for {collection_name}", fallback=_no_generation)
     def generative_search(self,
                          collection_name: str,
                          query: str,
@@ -370,34 +814,59 @@ class WeaviateOperations:
         Returns:
             Generated response with sources
         """
-        try:
-            client = self._get_client()
-            collection = client.collections.get(collection_name)
-            
-            response = collection.generate.near_text(
-                query=query,
-                single_prompt=prompt,
-                limit=limit
-            )
-            
-            result = {
-                "generated_text": response.generated if hasattr(response, 'generated') else None,
-                "sources": []
-            }
-            
-            for obj in response.objects:
-                source = {
-                    "uuid": str(obj.uuid),
-                    "properties": obj.properties,
-                    "generated": obj.generated.text if hasattr(obj, 'generated') and hasattr(obj.generated, 'text') else None
-                }
-                result["sources"].append(source)
-            
-            return result
+        collection = self._collection(collection_name)
+        
+        response = _retry(
+            collection.generate.near_text,
+            query=query,
+            single_prompt=prompt,
+            limit=limit
+        )
+        
+        return _generative_result(response)
+    
+    _generative_search_raw = generative_search.__wrapped__  # raises instead of logging
+    
+    @_log_errors("Generative hybrid search failed for {collection_name}", fallback=_no_generation)
+    def generative_hybrid(self,
+                          collection_name: str,
+                          query: str,
+                          prompt: str,
+                          alpha: float = 0.5,
+                          limit: int = 5,
+                          properties: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Perform generative search (RAG) over hybrid search results
+        
+        Retrieval and generation happen in one request instead of a
+        hybrid_search followed by a separate LLM call.
+        
+        Args:
+            collection_name: Collection to search
+            query: Search query
+            prompt: Generation prompt template
+            alpha: Balance between semantic (0.0) and keyword (1.0)
+            limit: Number of source objects
+            properties: Properties to return for the sources
             
-        except Exception as e:
-            logger.error(f"Generative search failed for {collection_name}: {str(e)}")
-            return {"generated_text": None, "sources": []}
+        Returns:
+            Generated response with sources
+        """
+        collection = self._collection(collection_name)
+        
+        response = _retry(
+            collection.generate.hybrid,
+            query=query,
+            alpha=alpha,
+            single_prompt=prompt,
+            fusion_type=_HYBRID_FUSION,
+            limit=limit,
+            return_properties=properties
+        )
+        
+        return _generative_result(response)
+    
+    _generative_hybrid_raw = generative_hybrid.__wrapped__  # raises instead of logging
 
 
 # Global operations instance
@@ -410,6 +879,11 @@ def create_collection(name: str, properties: List[Dict[str, Any]], **kwargs) ->
     return weaviate_ops.create_collection(name, properties, **kwargs)
 
 
+def ensure_collection(name: str, properties: List[Dict[str, Any]], **kwargs) -> bool:
+    """Create a collection unless it already exists"""
+    return weaviate_ops.ensure_collection(name, properties, **kwargs)
+
+
 def semantic_search(collection_name: str, query: str, **kwargs) -> List[Dict[str, Any]]:
     """Perform semantic search"""
     return weaviate_ops.semantic_search(collection_name, query, **kwargs)
@@ -417,4 +891,14 @@ def semantic_search(collection_name: str, query: str, **kwargs) -> List[Dict[str
 
 def insert_object(collection_name: str, properties: Dict[str, Any], **kwargs) -> Optional[str]:
     """Insert an object"""
-    return weaviate_ops.insert_object(collection_name, properties, **kwargs) 
\ No newline at end of file
+    return weaviate_ops.insert_object(collection_name, properties, **kwargs)
+
+
+def batch_insert(collection_name: str, objects: Iterable[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """Batch insert objects"""
+    return weaviate_ops.batch_insert(collection_name, objects, **kwargs)
+
+
+async def abatch_insert(collection_name: str, objects: Iterable[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """Batch insert objects with concurrent insert requests"""
+    return await weaviate_ops.abatch_insert(collection_name, objects, **kwargs)
@@ -19,14 +19,15 @@ fi
 # Check if Python dependencies are installed
 echo "📦 Checking Python dependencies..."
 cd backend
-if ! python -c "import flask, weaviate, pypdf" 2>/dev/null; then
+# Probe every runtime import from requirements.txt, not just a few of them
+if ! python -c "import flask, flask_cors, gunicorn, weaviate, dotenv, pydantic_settings, pypdf, pymupdf, orjson, streaming_form_data, openai, numpy, xxhash, tiktoken, zstandard" 2>/dev/null; then
     echo "🔧 Installing Python dependencies..."
     pip install -r requirements.txt
 fi
 
 # Start backend server in background
-echo "🐍 Starting Python Flask API server on port 5000..."
-python api_server.py &
+echo "🐍 Starting Python Flask API server on port 5001..."
+gunicorn -w 2 -k gthread --threads 4 -b 0.0.0.0:5001 api_server:app &
 BACKEND_PID=$!
 
 # Wait a moment for backend to start
@@ -50,10 +51,10 @@ echo ""
 echo "✅ Both servers are starting up!"
 echo ""
 echo "🌐 Frontend: http://localhost:3000"
-echo "🔌 Backend API: http://localhost:5000"
+echo "🔌 Backend API: http://localhost:5001"
 echo ""
 echo "📝 To test the API:"
-echo "   curl http://localhost:5000/health"
+echo "   curl http://localhost:5001/health"
 echo ""
 echo "🛑 To stop both servers: Press Ctrl+C"
 echo ""